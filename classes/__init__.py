@@ -1,7 +1,8 @@
+import importlib
+
 from .models import ConvertRequest, ConvertResponse, UploadResponse, VersionResponse, ImageInfo
 from .auth import verify_api_key
 from .config import API_VERSION, MAX_UPLOAD_SIZE_MB, docs_enabled
-from . import services
 
 __all__ = [
     "ConvertRequest",
@@ -15,3 +16,11 @@ __all__ = [
     "docs_enabled",
     "services"
 ]
+
+def __getattr__(name):
+    """Import the services module on first access, deferring its heavy conversion dependencies"""
+    if name == "services":
+        module = importlib.import_module(".services", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,11 @@
+import functools
+from pathlib import Path
+
+
+@functools.lru_cache(maxsize=1)
+def ensure_env():
+    """Load the project's .env file once per process"""
+    from dotenv import load_dotenv
+
+    # The .env file lives in the main project directory, the parent of the classes folder
+    load_dotenv(Path(__file__).parent.parent / ".env")
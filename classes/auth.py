@@ -1,14 +1,11 @@
 import os
-from pathlib import Path
-from dotenv import load_dotenv
+import hashlib
+from ._env import ensure_env
 from fastapi import HTTPException, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 # Load environment variables from the main project directory
-# Get the parent directory of the classes folder (which is the main project directory)
-main_dir = Path(__file__).parent.parent
-env_path = main_dir / ".env"
-load_dotenv(env_path)
+ensure_env()
 
 # Security - HTTPBearer for API key authentication
 security = HTTPBearer()
@@ -20,11 +17,19 @@ def get_valid_api_keys():
         raise ValueError("No API keys configured. Please set API_KEYS in .env file")
     return [key.strip() for key in api_keys_str.split(",") if key.strip()]
 
-VALID_API_KEYS = get_valid_api_keys()
+def _hash_api_key(api_key: str) -> bytes:
+    """Hash an API key to the fixed-size digest used for lookups"""
+    return hashlib.blake2b(api_key.encode(), digest_size=16).digest()
+
+VALID_API_KEYS = frozenset(get_valid_api_keys())
+
+# Keys are compared by digest so a lookup is a single O(1) set probe and does not
+# compare the raw key character by character
+_KEY_HASHES = frozenset(_hash_api_key(key) for key in VALID_API_KEYS)
 
 def verify_api_key(credentials: HTTPAuthorizationCredentials = Security(security)):
     """Verify the API key from the Authorization header"""
-    if credentials.credentials not in VALID_API_KEYS:
+    if _hash_api_key(credentials.credentials) not in _KEY_HASHES:
         raise HTTPException(
             status_code=401,
             detail="Invalid API key",
@@ -1,12 +1,8 @@
 import os
-from pathlib import Path
-from dotenv import load_dotenv
+from ._env import ensure_env
 
 # Load environment variables from the main project directory
-# Get the parent directory of the classes folder (which is the main project directory)
-main_dir = Path(__file__).parent.parent
-env_path = main_dir / ".env"
-load_dotenv(env_path)
+ensure_env()
 
 # Application version
 API_VERSION = "1.2.7"
@@ -21,6 +17,26 @@ MAX_UPLOAD_SIZE_MB = int(os.getenv("MAX_UPLOAD_SIZE_MB", "100"))  # Default 100M
 # Images directory configuration
 IMAGES_DIR = os.getenv("IMAGES_DIR", "/static/images")  # Default /static/images
 
+# Number of threads used to extract images from a single document
+# Capped at 8 by default: more threads mostly add contention, especially on rotating disks
+IMAGE_EXTRACT_WORKERS = max(1, int(os.getenv("IMAGE_EXTRACT_WORKERS", str(min(8, os.cpu_count() or 1)))))
+
+# PDFs with more pages than this are split into tasks of this many pages and extracted
+# in worker processes; smaller PDFs are handled in-process
+PDF_PAGES_PER_TASK = max(1, int(os.getenv("PDF_PAGES_PER_TASK", "10")))
+
+# Only PDFs at least this large (in MB) are extracted in worker processes; below it the
+# process start-up and hand-off cost more than the extraction itself
+PDF_PROCESS_MIN_SIZE_MB = max(0, int(os.getenv("PDF_PROCESS_MIN_SIZE_MB", "50")))
+
+# Number of recent URL conversions whose MarkItDown output is kept in memory, keyed by
+# the downloaded content; 0 disables the cache
+URL_CONVERT_CACHE_SIZE = max(0, int(os.getenv("URL_CONVERT_CACHE_SIZE", "256")))
+
+# Number of recent local file conversions whose MarkItDown output is kept in memory, keyed by
+# path, modification time and size; 0 disables the cache
+FILE_CONVERT_CACHE_SIZE = max(0, int(os.getenv("FILE_CONVERT_CACHE_SIZE", "128")))
+
 # Base URL for image downloads
 IMAGE_BASE_URL = os.getenv("IMAGE_BASE_URL", "http://localhost:8000")  # Default localhost
 
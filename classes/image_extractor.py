@@ -1,34 +1,424 @@
 import os
+import re
+import binascii
 import shutil
-import uuid
+import secrets
 import zipfile
 import tempfile
 import time
+import threading
+import multiprocessing
+import contextlib
+import io
+import mmap
+import struct
+import hashlib
+import itertools
+import logging
+import sqlite3
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import datetime
 from pathlib import Path
-from typing import List, Dict, Any
-from PIL import Image
-import fitz  # PyMuPDF for PDF image extraction
-from docx import Document
-from docx.image.exceptions import UnrecognizedImageError
-import xml.etree.ElementTree as ET
+from typing import List, Dict, Any, Optional, Tuple
 from classes.models import ImageInfo
 from classes import config
 
+logger = logging.getLogger(__name__)
+
+# Heavy imaging backends are imported on first use by the extractor that needs them,
+# so importing this module (and handling formats that don't need them) stays cheap
+fitz = None  # PyMuPDF for PDF image extraction
+Image = None
+Document = None
+pyvips = None  # optional libvips binding for PNG conversion
+_pyvips_checked = False
+_EMBED_IDS_XPATH = None
+_BODY_DRAWINGS_XPATH = None
+
+# WordprocessingML namespace and paragraph tag
+_W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+_W_P_TAG = f'{{{_W_NS}}}p'
+
+
+def _load_fitz():
+    """Import PyMuPDF on first use"""
+    global fitz
+    if fitz is None:
+        import fitz as _fitz
+        fitz = _fitz
+    return fitz
+
+
+def _load_pil():
+    """Import PIL.Image on first use"""
+    global Image
+    if Image is None:
+        from PIL import Image as _Image
+        Image = _Image
+    return Image
+
+
+def _load_pyvips():
+    """Import pyvips on first use, returning None when it (or libvips) isn't installed"""
+    global pyvips, _pyvips_checked
+    if not _pyvips_checked:
+        _pyvips_checked = True
+        try:
+            import pyvips as _pyvips
+            pyvips = _pyvips
+        except Exception:
+            # ImportError without the binding, OSError when libvips itself can't be loaded
+            pass
+    return pyvips
+
+
+def _load_docx():
+    """Import python-docx on first use"""
+    global Document, _EMBED_IDS_XPATH, _BODY_DRAWINGS_XPATH
+    if Document is None:
+        from docx import Document as _Document
+        from lxml import etree
+        # Relationship IDs of embedded pictures: r:embed on a:blip, or any other attribute named embed
+        _EMBED_IDS_XPATH = etree.XPath('.//@*[local-name()="embed"]')
+        # Drawings inside the runs of the body's top-level paragraphs, in document order
+        _BODY_DRAWINGS_XPATH = etree.XPath('./w:p/w:r//w:drawing', namespaces={'w': _W_NS})
+        Document = _Document
+    return Document
+
+
+# Raster image extensions extracted from document media folders
+_IMG_EXTS = frozenset({'png', 'jpg', 'jpeg', 'gif', 'bmp', 'tiff'})
+
+# Archives may also contain SVG images, which are kept as-is
+_ARCHIVE_IMG_EXTS = _IMG_EXTS | {'svg'}
+
+# Characters dropped from folder and file names: anything but letters, digits (\w matches
+# exactly what str.isalnum() accepts, plus '_'), spaces and hyphens - and dots for file names
+_UNSAFE_FOLDER_CHARS_RE = re.compile(r'[^\w \-]')
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r'[^\w .\-]')
+
+# Spaces and hyphens in folder names become underscores
+_FOLDER_SEPARATORS = str.maketrans(' -', '__')
+
+# oxipng, when installed, recompresses a document's PNGs in one parallel batch after extraction
+_OXIPNG = shutil.which('oxipng')
+
+# Threads used to delete expired image folders; kept modest so cleanup doesn't saturate the disk
+_CLEANUP_WORKERS = min(8, os.cpu_count() or 1)
+
+# Process pool for extracting images from large PDFs, created on first use
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+# Base64 data URLs embedded in HTML/XML documents; the payload is limited to the base64
+# alphabet so a match ends at the closing quote or parenthesis, and an unquoted data URL
+# in running text doesn't take the following words along with it
+_DATA_URL_RE = re.compile(rb'data:image/([^;]+);base64,([A-Za-z0-9+/=]+)')
+
+# pybase64 decodes with SIMD instructions when it is installed; fall back to the stdlib decoder
+try:
+    import pybase64
+
+    def _b64decode(data) -> bytes:
+        return pybase64.b64decode(data, validate=False)
+except ImportError:
+    _b64decode = binascii.a2b_base64
+
+# Cross-document index of saved images keyed by content digest. It sits beside the images
+# directory rather than inside it, so the static mount never serves it
+_BLOB_INDEX_NAME = '.image_blob_index.sqlite'
+
+# Image signatures keyed by their first byte: (magic bytes, file extension)
+_IMAGE_MAGIC = {
+    0x89: (b'\x89PNG', 'png'),
+    0xFF: (b'\xff\xd8\xff', 'jpeg'),
+    ord('G'): (b'GIF', 'gif'),
+    ord('B'): (b'BM', 'bmp'),
+}
+
+# Image file suffixes kept without PNG conversion, mapped to the format their content must have
+_NATIVE_IMAGE_SUFFIXES = {'.jpg': 'jpeg', '.jpeg': 'jpeg', '.gif': 'gif'}
+
+# Embedded PDF image formats that browsers display natively
+_PDF_PASSTHROUGH_EXTS = frozenset({'png', 'jpeg', 'jpg', 'gif'})
+
+# Number of leading bytes kept in memory for header-based dimension parsing
+_HEADER_PEEK_SIZE = 64 * 1024
+
+# JPEG start-of-frame markers (every SOFn except DHT, JPG and DAC)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _peek_dimensions(data: bytes) -> Tuple[Optional[int], Optional[int]]:
+    """Read image width/height straight from PNG, JPEG, GIF or BMP header bytes"""
+    if data[:8] == b'\x89PNG\r\n\x1a\n' and data[12:16] == b'IHDR' and len(data) >= 24:
+        return struct.unpack('>II', data[16:24])
+
+    if data[:6] in (b'GIF87a', b'GIF89a') and len(data) >= 10:
+        return struct.unpack('<HH', data[6:10])
+
+    if data[:2] == b'BM' and len(data) >= 26:
+        if struct.unpack('<I', data[14:18])[0] == 12:  # OS/2 BITMAPCOREHEADER
+            return struct.unpack('<HH', data[18:22])
+        width, height = struct.unpack('<ii', data[18:26])
+        return width, abs(height)  # Negative height marks a top-down bitmap
+
+    if data[:2] == b'\xff\xd8':
+        # Walk the marker segments until we reach a start-of-frame header
+        i = 2
+        while i + 9 <= len(data):
+            if data[i] != 0xFF:
+                break
+            marker = data[i + 1]
+            if marker == 0xFF:  # Fill byte
+                i += 1
+                continue
+            if marker == 0x01 or 0xD0 <= marker <= 0xD8:  # Markers without a length
+                i += 2
+                continue
+            if marker in _JPEG_SOF_MARKERS:
+                height, width = struct.unpack('>HH', data[i + 5:i + 9])
+                return width, height
+            i += 2 + struct.unpack('>H', data[i + 2:i + 4])[0]
+
+    return None, None
+
+
+def _unique_entry_names(entries: List[Tuple[Any, str]]) -> List[Tuple[Any, str]]:
+    """
+    Give archive entries distinct target filenames, suffixing basenames that repeat. Names are
+    compared by lowercased stem, since conversion turns pic.bmp into pic.png and some filesystems
+    ignore case, so no two entries saved concurrently ever touch the same path.
+    """
+    used = set()
+    unique = []
+    for entry, name in entries:
+        stem, dot, ext = name.rpartition('.')
+        candidate_stem = stem
+        counter = 1
+        while candidate_stem.lower() in used:
+            counter += 1
+            candidate_stem = f"{stem}_{counter}"
+        used.add(candidate_stem.lower())
+        unique.append((entry, f"{candidate_stem}{dot}{ext}"))
+    return unique
+
+
+def _write_file(path: Path, data: bytes) -> None:
+    """Write an in-memory blob with direct os.write calls, bypassing Python's buffered I/O layer"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _extract_pdf_pages(file_path, page_numbers: range, output_folder, owned_xrefs: Optional[set],
+                       write_workers: int = 1):
+    """Save the images on a run of PDF pages and record where each one occurs.
+
+    Runs in a worker process for large PDFs, so it opens its own document handle. Only
+    xrefs in owned_xrefs are saved (every new xref when it is None), written by up to
+    write_workers threads; returns
+    ({xref: (filename, width, height, digest)}, [(page_num, xref, x, y, context), ...]).
+    """
+    _load_fitz()
+    output_folder = Path(output_folder)
+    # PDFs often reference the same XObject (logos, backgrounds) on every page;
+    # save each xref once and point later occurrences at the same file
+    saved = {}
+    saved_digests = {}
+    occurrences = []
+    # PyMuPDF documents aren't thread-safe, so all MuPDF work stays on this thread;
+    # only the encoded bytes are handed to a pool to be written out in parallel.
+    # Worker processes already run side by side, so they write inline instead
+    writes = []
+    writer_pool = ThreadPoolExecutor(max_workers=write_workers) if write_workers > 1 else contextlib.nullcontext()
+    try:
+        with fitz.open(file_path) as pdf_document, writer_pool as writer:
+            for page_num in page_numbers:
+                page = pdf_document[page_num]
+                # Soft masks are only referenced by their parent image, not listed themselves
+                image_list = page.get_images(full=False)
+                if not image_list:
+                    continue
+
+                # Extract text for this page to help with positioning context
+                page_text = page.get_text()
+                page_dict = page.get_text("dict")
+
+                # Get image positions from page
+                image_rects = [block["bbox"] for block in page_dict.get("blocks", []) if "image" in block]
+
+                for img_index, img in enumerate(image_list):
+                    xref = img[0]
+                    if xref not in saved and (owned_xrefs is None or xref in owned_xrefs):
+                        # Browser-friendly streams are written as-is, skipping the PNG re-encode
+                        info = pdf_document.extract_image(xref)
+                        if info and info.get('ext') in _PDF_PASSTHROUGH_EXTS and info.get('colorspace', 3) != 4:
+                            filename = f"page_{page_num + 1}_img_{img_index + 1}.{info['ext']}"
+                            image_data = info['image']
+                            width, height = info['width'], info['height']
+                        else:
+                            pix = fitz.Pixmap(pdf_document, xref)
+                            if pix.n - pix.alpha >= 4:
+                                # CMYK and other 4+ channel images can't be written as PNG;
+                                # convert them to RGB instead of dropping them
+                                pix = fitz.Pixmap(fitz.csRGB, pix)
+
+                            filename = f"page_{page_num + 1}_img_{img_index + 1}.png"
+                            image_data = pix.tobytes('png')
+
+                            # The pixmap already knows its dimensions - no need to reopen the PNG
+                            width, height = pix.width, pix.height
+                            pix = None
+                        info = None
+
+                        # Separate xrefs can still carry byte-identical images
+                        digest = hashlib.blake2b(image_data, digest_size=16).digest()
+                        if digest in saved_digests:
+                            filename = saved_digests[digest]
+                        else:
+                            saved_digests[digest] = filename
+                            if writer is None:
+                                _write_file(output_folder / filename, image_data)
+                            else:
+                                writes.append(writer.submit(_write_file, output_folder / filename, image_data))
+                        image_data = None
+                        saved[xref] = (filename, width, height, digest)
+
+                    # Use the image index to get approximate position
+                    position_x, position_y = None, None
+                    if img_index < len(image_rects):
+                        bbox = image_rects[img_index]
+                        position_x = bbox[0]  # Left coordinate
+                        position_y = bbox[1]  # Top coordinate
+
+                    # Get surrounding text context for better positioning
+                    content_context = ImageExtractor._get_text_context_around_image(page_text, position_y) if position_y else None
+
+                    occurrences.append((page_num, xref, position_x, position_y, content_context))
+
+        # Surface the first failed write, if any
+        for future in writes:
+            future.result()
+    except Exception as e:
+        print(f"Error extracting images from PDF: {e}")
+
+    return saved, occurrences
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """Return the shared process pool used for large PDFs, starting it on first use"""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            # Workers are spawned rather than forked: the API process runs threads,
+            # which fork does not carry over safely
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=config.IMAGE_EXTRACT_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _pdf_pool
+
+
+def shutdown_pdf_pool() -> None:
+    """Stop the PDF worker processes, if any were started"""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown(wait=True, cancel_futures=True)
+            _pdf_pool = None
+
+
+def _reset_pdf_pool() -> None:
+    """Drop a broken PDF process pool so the next large PDF starts a new one"""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown(wait=False, cancel_futures=True)
+            _pdf_pool = None
+
+
+class _MappedFile(io.RawIOBase):
+    """Seekable read-only file over a memory map; each instance keeps its own position"""
+
+    def __init__(self, mapped: mmap.mmap):
+        super().__init__()
+        self.mapped = mapped
+        self._pos = 0
+
+    def view(self) -> '_MappedFile':
+        """Return an independent reader over the same mapping"""
+        return _MappedFile(self.mapped)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self.mapped)
+        if offset < 0:
+            raise OSError(f"Invalid seek position {offset}")
+        self._pos = offset
+        return offset
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self.mapped) if size is None or size < 0 else self._pos + size
+        data = self.mapped[self._pos:end]
+        self._pos += len(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
 class ImageExtractor:
     """Extract images from various document types and save them to accessible folders"""
 
+    # Extraction method for each supported file extension
+    _EXTRACTORS = {
+        '.pdf': '_extract_from_pdf',
+        '.docx': '_extract_from_docx', '.doc': '_extract_from_docx',
+        '.pptx': '_extract_from_pptx', '.ppt': '_extract_from_pptx',
+        '.xlsx': '_extract_from_excel', '.xls': '_extract_from_excel',
+        '.odt': '_extract_from_odf', '.ods': '_extract_from_odf', '.odp': '_extract_from_odf',
+        '.html': '_extract_from_html_xml', '.htm': '_extract_from_html_xml', '.xml': '_extract_from_html_xml',
+        '.zip': '_extract_from_archive', '.rar': '_extract_from_archive', '.7z': '_extract_from_archive',
+    }
+
     def __init__(self, base_url: str = None, images_dir: str = None):
         # Use config.IMAGE_BASE_URL if no specific base_url is provided
         self.base_url = (base_url or config.IMAGE_BASE_URL).rstrip('/')
         # Use config.IMAGES_DIR if no specific directory is provided
         self.images_dir = Path(images_dir or config.IMAGES_DIR)
         # Don't create directory immediately - do it lazily when first needed
+        self._dir_ready = False
+        # Per-thread blob index connection and the rows pending for the current document
+        self._blob_local = threading.local()
 
     def _ensure_images_dir_exists(self):
         """Ensure the images directory exists, create if necessary"""
+        # Only the first call needs the mkdir; document folders are created with parents=True anyway
+        if self._dir_ready:
+            return
         try:
             self.images_dir.mkdir(parents=True, exist_ok=True, mode=0o755)
+            self._dir_ready = True
         except PermissionError:
             # If we can't create the directory, try to use a temporary location
             # This should align with the fallback used in main.py
@@ -41,12 +431,12 @@ class ImageExtractor:
             self.images_dir = temp_dir
             print(f"Warning: Could not create {old_images_dir}, using temporary directory: {temp_dir}")
             print(f"Images will be served from temporary location")
+            self._dir_ready = True
 
     def extract_images_from_file(self, file_path: str, document_name: str) -> List[ImageInfo]:
         """Extract images from a file based on its extension"""
-        print(f"DEBUG: ImageExtractor.extract_images_from_file called with:")
-        print(f"DEBUG: - file_path: {file_path}")
-        print(f"DEBUG: - document_name: {document_name}")
+        logger.debug("ImageExtractor.extract_images_from_file called with file_path=%s, document_name=%s",
+                     file_path, document_name)
 
         # Ensure directory exists before extraction
         self._ensure_images_dir_exists()
@@ -54,31 +444,109 @@ class ImageExtractor:
         file_path = Path(file_path)
         document_folder = self._create_document_folder(document_name)
 
-        print(f"DEBUG: Created document folder: {document_folder}")
-
-        if file_path.suffix.lower() == '.pdf':
-            return self._extract_from_pdf(file_path, document_folder)
-        elif file_path.suffix.lower() in ['.docx', '.doc']:
-            return self._extract_from_docx(file_path, document_folder)
-        elif file_path.suffix.lower() in ['.pptx', '.ppt']:
-            return self._extract_from_pptx(file_path, document_folder)
-        elif file_path.suffix.lower() in ['.xlsx', '.xls']:
-            return self._extract_from_excel(file_path, document_folder)
-        elif file_path.suffix.lower() in ['.odt', '.ods', '.odp']:
-            return self._extract_from_odf(file_path, document_folder)
-        elif file_path.suffix.lower() in ['.html', '.htm', '.xml']:
-            return self._extract_from_html_xml(file_path, document_folder)
-        elif file_path.suffix.lower() in ['.zip', '.rar', '.7z']:
-            return self._extract_from_archive(file_path, document_folder)
-        else:
+        logger.debug("Created document folder: %s", document_folder)
+
+        extract = self._EXTRACTORS.get(file_path.suffix.lower())
+        if extract is None:
             return []
 
+        self._blob_local.pending = []
+        try:
+            images = getattr(self, extract)(file_path, document_folder)
+        finally:
+            pending, self._blob_local.pending = self._blob_local.pending, None
+            if pending:
+                self._record_blobs(pending)
+
+        if _OXIPNG:
+            self._optimize_pngs(document_folder, images)
+        return images
+
+    @staticmethod
+    def _optimize_pngs(document_folder: Path, images: List[ImageInfo]) -> None:
+        """Losslessly recompress a document's PNGs with a single oxipng run"""
+        png_paths = list(dict.fromkeys(
+            str(document_folder / image.filename) for image in images if image.filename.endswith('.png')
+        ))
+        if not png_paths:
+            return
+        try:
+            subprocess.run(
+                [_OXIPNG, '-o', '2', '--strip', 'safe', '-t', str(os.cpu_count() or 1), *png_paths],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"Error optimizing PNG images: {e}")
+
+    def _blob_index(self) -> Optional[sqlite3.Connection]:
+        """Return this thread's connection to the blob index, or None if it can't be opened"""
+        conn = getattr(self._blob_local, 'conn', None)
+        if conn is None:
+            try:
+                conn = sqlite3.connect(self.images_dir.parent / _BLOB_INDEX_NAME, timeout=30)
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('CREATE TABLE IF NOT EXISTS blobs (digest BLOB PRIMARY KEY, '
+                             'folder TEXT, filename TEXT, width INTEGER, height INTEGER)')
+            except sqlite3.Error as e:
+                print(f"Warning: image blob index unavailable: {e}")
+                conn = False
+            self._blob_local.conn = conn
+        return conn or None
+
+    def _record_blobs(self, rows: List[Tuple]) -> None:
+        """Add a document's newly written images to the blob index in one transaction"""
+        conn = self._blob_index()
+        if conn is None:
+            return
+        try:
+            with conn:
+                conn.executemany('INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?)', rows)
+        except sqlite3.Error as e:
+            print(f"Error updating image blob index: {e}")
+
+    def _forget_blobs(self, folder_names: List[str]) -> None:
+        """Remove the blob index rows of deleted image folders in one transaction"""
+        if not folder_names:
+            return
+        conn = self._blob_index()
+        if conn is None:
+            return
+        try:
+            with conn:
+                conn.executemany('DELETE FROM blobs WHERE folder = ?', [(name,) for name in folder_names])
+        except sqlite3.Error as e:
+            print(f"Error updating image blob index: {e}")
+
+    def _link_indexed_image(self, digest: bytes, output_folder: Path,
+                            filename: str) -> Optional[Tuple[str, Optional[int], Optional[int]]]:
+        """Hard-link an identical image saved for an earlier document, if there is one"""
+        conn = self._blob_index()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute('SELECT folder, filename, width, height FROM blobs WHERE digest = ?',
+                               (digest,)).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+
+        folder, indexed_name, width, height = row
+        final_filename = Path(filename).stem + Path(indexed_name).suffix
+        try:
+            os.link(self.images_dir / folder / indexed_name, output_folder / final_filename)
+        except OSError:
+            # The earlier folder was cleaned up (or the filesystem has no hard links);
+            # the caller writes the image and its index row is replaced
+            return None
+        return final_filename, width, height
+
     def _create_document_folder(self, document_name: str) -> Path:
         """Create a unique folder for the document's images"""
-        safe_name = "".join(c for c in document_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        safe_name = _UNSAFE_FOLDER_CHARS_RE.sub('', document_name).rstrip()
         # Convert to lowercase and replace spaces and hyphens with underscores
-        safe_name = safe_name.lower().replace(' ', '_').replace('-', '_')
-        unique_id = str(uuid.uuid4())[:8]
+        safe_name = safe_name.lower().translate(_FOLDER_SEPARATORS)
+        unique_id = secrets.token_hex(4)
         folder_name = f"{safe_name}_{unique_id}"
         document_folder = self.images_dir / folder_name
         document_folder.mkdir(parents=True, exist_ok=True)
@@ -87,66 +555,85 @@ class ImageExtractor:
     def _extract_from_pdf(self, file_path: Path, output_folder: Path) -> List[ImageInfo]:
         """Extract images from PDF files with positioning information"""
         images = []
+        url_prefix = f"{self.base_url}/images/{output_folder.name}"
         try:
-            pdf_document = fitz.open(file_path)
-
-            for page_num in range(len(pdf_document)):
-                page = pdf_document.load_page(page_num)
-                image_list = page.get_images()
-
-                # Extract text for this page to help with positioning context
-                page_text = page.get_text()
-                page_dict = page.get_text("dict")
-
-                for img_index, img in enumerate(image_list):
-                    xref = img[0]
-                    pix = fitz.Pixmap(pdf_document, xref)
-
-                    if pix.n - pix.alpha < 4:  # GRAY or RGB
-                        filename = f"page_{page_num + 1}_img_{img_index + 1}.png"
-                        image_path = output_folder / filename
-                        pix.save(str(image_path))
-
-                        # Get image dimensions
-                        with Image.open(image_path) as img_obj:
-                            width, height = img_obj.size
-
-                        # Get image position from page
-                        image_rects = []
-                        for block in page_dict.get("blocks", []):
-                            if "image" in block:
-                                image_rects.append(block["bbox"])
-
-                        # Use the image index to get approximate position
-                        position_x, position_y = None, None
-                        if img_index < len(image_rects):
-                            bbox = image_rects[img_index]
-                            position_x = bbox[0]  # Left coordinate
-                            position_y = bbox[1]  # Top coordinate
-
-                        # Get surrounding text context for better positioning
-                        content_context = self._get_text_context_around_image(page_text, position_y) if position_y else None
-
-                        images.append(ImageInfo(
-                            filename=filename,
-                            url=f"{self.base_url}/images/{output_folder.name}/{filename}",
-                            width=width,
-                            height=height,
-                            page_number=page_num + 1,
-                            position_x=position_x,
-                            position_y=position_y,
-                            content_context=content_context
-                        ))
-
-                    pix = None
+            _load_fitz()
+            with fitz.open(file_path) as pdf_document:
+                page_count = pdf_document.page_count
+                pages_per_task = config.PDF_PAGES_PER_TASK
+                # Starting and feeding worker processes costs far more than extracting a typical
+                # PDF in-process, so only large files are split across them
+                if (config.IMAGE_EXTRACT_WORKERS > 1 and page_count > pages_per_task and
+                        os.path.getsize(file_path) >= config.PDF_PROCESS_MIN_SIZE_MB * 1024 * 1024):
+                    # Each image is saved by the task holding the page it first appears on
+                    first_pages = {}
+                    for page_num, page in enumerate(pdf_document):
+                        for img in page.get_images(full=False):
+                            first_pages.setdefault(img[0], page_num)
+                    tasks = []
+                    for start in range(0, page_count, pages_per_task):
+                        page_numbers = range(start, min(start + pages_per_task, page_count))
+                        owned_xrefs = {xref for xref, page_num in first_pages.items() if page_num in page_numbers}
+                        tasks.append((page_numbers, owned_xrefs))
+                else:
+                    tasks = [(range(page_count), None)]
 
-            pdf_document.close()
+            results = None
+            if len(tasks) > 1:
+                try:
+                    pool = _get_pdf_pool()
+                    futures = [
+                        pool.submit(_extract_pdf_pages, str(file_path), page_numbers, str(output_folder), owned_xrefs)
+                        for page_numbers, owned_xrefs in tasks
+                    ]
+                    results = [future.result() for future in futures]
+                except Exception as e:
+                    # Page errors are handled inside the tasks, so this is the pool itself failing
+                    # (e.g. a crashed worker); start a fresh one next time
+                    if isinstance(e, BrokenProcessPool):
+                        _reset_pdf_pool()
+                    print(f"PDF worker pool failed, extracting images in-process: {e}")
+            if results is None:
+                results = [_extract_pdf_pages(file_path, range(page_count), output_folder, None,
+                                              config.IMAGE_EXTRACT_WORKERS)]
+
+            # Tasks only deduplicate within their own pages, so byte-identical images saved by
+            # different tasks are collapsed onto the earliest file here
+            files = {}
+            digest_files = {}
+            replaced_files = {}
+            for saved, _ in results:
+                for xref, (filename, width, height, digest) in saved.items():
+                    if filename in replaced_files:
+                        filename = replaced_files[filename]
+                    elif digest_files.setdefault(digest, filename) != filename:
+                        (output_folder / filename).unlink(missing_ok=True)
+                        filename = replaced_files[filename] = digest_files[digest]
+                    files[xref] = (filename, width, height)
+
+            for _, occurrences in results:
+                for page_num, xref, position_x, position_y, content_context in occurrences:
+                    if xref not in files:
+                        continue
+                    filename, width, height = files[xref]
+                    # Every field is produced by the extractor itself, so pydantic validation is skipped
+                    images.append(ImageInfo.model_construct(
+                        filename=filename,
+                        url=f"{url_prefix}/{filename}",
+                        width=width,
+                        height=height,
+                        page_number=page_num + 1,
+                        position_x=position_x,
+                        position_y=position_y,
+                        content_context=content_context
+                    ))
         except Exception as e:
             print(f"Error extracting images from PDF: {e}")
 
         return images
 
-    def _get_text_context_around_image(self, page_text: str, image_y_position: float) -> str:
+    @staticmethod
+    def _get_text_context_around_image(page_text: str, image_y_position: float) -> str:
         """Extract text context around where an image appears on the page"""
         if not page_text or image_y_position is None:
             return None
@@ -161,7 +648,9 @@ class ImageExtractor:
     def _extract_from_docx(self, file_path: Path, output_folder: Path) -> List[ImageInfo]:
         """Extract images from DOCX files with positioning information"""
         images = []
+        url_prefix = f"{self.base_url}/images/{output_folder.name}"
         try:
+            _load_docx()
             doc = Document(file_path)
 
             # Create a mapping of image relationships to actual images
@@ -173,333 +662,287 @@ class ImageExtractor:
             # Track processed images to avoid duplicates
             processed_images = set()
             image_count = 0
+            # Images are written as they are found and converted to PNG together at the end
+            written_images = []
+
+            # doc.paragraphs builds a new list of proxies on every access, so fetch it once.
+            # Paragraph texts and their running character offsets are only computed once an
+            # image is found, then shared by every image's context and position lookup
+            paragraphs = doc.paragraphs
+            paragraph_texts = None
+            paragraph_offsets = None
+
+            # Find every drawing in the runs of top-level paragraphs with one query over the
+            # body, then map each back to its paragraph (the outermost enclosing w:p)
+            paragraph_indexes = {paragraph._element: idx for idx, paragraph in enumerate(paragraphs)}
+            for drawing in _BODY_DRAWINGS_XPATH(doc.element.body):
+                paragraph_idx = paragraph_indexes.get(list(drawing.iterancestors(_W_P_TAG))[-1])
+                try:
+                    # Get all attributes that might contain image references
+                    embed_ids = self._extract_embed_ids_from_drawing(drawing)
 
-            # Walk through document elements to find images and their positions
-            for paragraph_idx, paragraph in enumerate(doc.paragraphs):
-                # Check for images in this paragraph using a simpler approach
-                for run in paragraph.runs:
-                    # Check if this run contains images by looking for drawing elements
-                    if hasattr(run._element, 'xpath'):
-                        try:
-                            # Look for drawing elements (simpler xpath without namespaces)
-                            drawings = run._element.xpath('.//w:drawing')
-                            if drawings:
-                                # Look for embedded image references
-                                for drawing in drawings:
-                                    # Get all attributes that might contain image references
-                                    embed_ids = self._extract_embed_ids_from_drawing(drawing)
-
-                                    for embed_id in embed_ids:
-                                        if embed_id and embed_id in image_rels:
-                                            # Create a unique identifier for this image data
-                                            image_data = image_rels[embed_id]
-                                            image_hash = hash(image_data)
-
-                                            # Skip if we've already processed this exact image
-                                            if image_hash in processed_images:
-                                                print(f"DEBUG: Skipping duplicate image with embed_id {embed_id}")
-                                                continue
-
-                                            processed_images.add(image_hash)
-                                            image_count += 1
-
-                                            # Determine file extension from image data
-                                            extension = self._get_image_extension(image_data)
-                                            temp_filename = f"image_{image_count}.{extension}"
-                                            temp_image_path = output_folder / temp_filename
-
-                                            with open(temp_image_path, 'wb') as f:
-                                                f.write(image_data)
-
-                                            # Convert to PNG and cleanup original
-                                            final_image_path = self._convert_to_png_and_cleanup(temp_image_path)
-                                            final_filename = final_image_path.name
-
-                                            # Get image dimensions
-                                            try:
-                                                with Image.open(final_image_path) as img_obj:
-                                                    width, height = img_obj.size
-                                            except:
-                                                width, height = None, None
-
-                                            # Create context from surrounding paragraphs
-                                            content_context = self._get_docx_context(doc.paragraphs, paragraph_idx)
-
-                                            # Calculate position in content (character-based estimation)
-                                            position_in_content = self._estimate_content_position(doc.paragraphs, paragraph_idx)
-
-                                            images.append(ImageInfo(
-                                                filename=final_filename,
-                                                url=f"{self.base_url}/images/{output_folder.name}/{final_filename}",
-                                                width=width,
-                                                height=height,
-                                                position_in_content=position_in_content,
-                                                content_context=content_context
-                                            ))
-
-                                            print(f"DEBUG: Found unique image {final_filename} at paragraph {paragraph_idx}, context: {content_context[:50] if content_context else 'None'}...")
-                        except Exception as e:
-                            print(f"DEBUG: Error processing run in paragraph {paragraph_idx}: {e}")
-                            continue
+                    for embed_id in embed_ids:
+                        if embed_id and embed_id in image_rels:
+                            # Create a unique identifier for this image data
+                            image_data = image_rels[embed_id]
+                            image_hash = hashlib.blake2b(image_data, digest_size=16).digest()
+
+                            # Skip if we've already processed this exact image
+                            if image_hash in processed_images:
+                                logger.debug("Skipping duplicate image with embed_id %s", embed_id)
+                                continue
+
+                            processed_images.add(image_hash)
+                            image_count += 1
+
+                            # Determine file extension from image data
+                            extension = self._get_image_extension(image_data)
+                            temp_filename = f"image_{image_count}.{extension}"
+
+                            # Formats the header parser doesn't know (EMF/WMF) simply have no dimensions
+                            final_filename, width, height, written = self._write_image(
+                                image_data, output_folder, temp_filename, image_hash
+                            )
+
+                            if paragraph_texts is None:
+                                paragraph_texts = [p.text for p in paragraphs]
+                                paragraph_offsets = list(itertools.accumulate(
+                                    (len(text) + 1 for text in paragraph_texts), initial=0  # +1 for newline
+                                ))
+
+                            # Create context from surrounding paragraphs
+                            content_context = self._get_docx_context(paragraph_texts, paragraph_idx)
+
+                            # Calculate position in content (character-based estimation)
+                            position_in_content = paragraph_offsets[paragraph_idx]
+
+                            image_info = ImageInfo.model_construct(
+                                filename=final_filename,
+                                url=f"{url_prefix}/{final_filename}",
+                                width=width,
+                                height=height,
+                                position_in_content=position_in_content,
+                                content_context=content_context
+                            )
+                            images.append(image_info)
+                            if written:
+                                written_images.append((image_info, image_hash))
+
+                            logger.debug("Found unique image %s at paragraph %s, context: %.50s...",
+                                         final_filename, paragraph_idx, content_context)
+                except Exception as e:
+                    logger.debug("Error processing drawing in paragraph %s: %s", paragraph_idx, e)
+                    continue
 
             # If no images found through paragraph analysis, fall back to relationship method
             if not images:
-                print("DEBUG: No images found in paragraph analysis, using relationship fallback")
+                logger.debug("No images found in paragraph analysis, using relationship fallback")
                 processed_rels = set()
                 for rel in doc.part.rels.values():
                     if "image" in rel.target_ref and rel.rId not in processed_rels:
                         try:
                             processed_rels.add(rel.rId)
                             image_data = rel.target_part.blob
-                            temp_filename = f"image_{len(images) + 1}.{rel.target_ref.split('.')[-1]}"
-                            temp_image_path = output_folder / temp_filename
-
-                            with open(temp_image_path, 'wb') as f:
-                                f.write(image_data)
 
-                            # Convert to PNG and cleanup original
-                            final_image_path = self._convert_to_png_and_cleanup(temp_image_path)
-                            final_filename = final_image_path.name
+                            # Skip relationships that point at an image we've already saved
+                            image_hash = hashlib.blake2b(image_data, digest_size=16).digest()
+                            if image_hash in processed_images:
+                                continue
+                            processed_images.add(image_hash)
 
-                            # Get image dimensions
-                            try:
-                                with Image.open(final_image_path) as img_obj:
-                                    width, height = img_obj.size
-                            except:
-                                width, height = None, None
+                            temp_filename = f"image_{len(images) + 1}.{rel.target_ref.split('.')[-1]}"
+                            final_filename, width, height, written = self._write_image(
+                                image_data, output_folder, temp_filename, image_hash
+                            )
 
-                            images.append(ImageInfo(
+                            image_info = ImageInfo.model_construct(
                                 filename=final_filename,
-                                url=f"{self.base_url}/images/{output_folder.name}/{final_filename}",
+                                url=f"{url_prefix}/{final_filename}",
                                 width=width,
                                 height=height
-                            ))
+                            )
+                            images.append(image_info)
+                            if written:
+                                written_images.append((image_info, image_hash))
                         except Exception as e:
                             print(f"Error extracting image from DOCX: {e}")
 
+            if written_images:
+                self._convert_written_images(output_folder, written_images)
+
         except Exception as e:
             print(f"Error processing DOCX file: {e}")
 
         return images
 
-    def _extract_embed_ids_from_drawing(self, drawing_element) -> List[str]:
-        """Extract embed IDs from a drawing element using string parsing as fallback"""
-        embed_ids = []
-        try:
-            # Convert element to string and search for embed references
-            element_str = str(drawing_element.xml) if hasattr(drawing_element, 'xml') else str(drawing_element)
+    def _persist_image(self, image_data: bytes, output_folder: Path, filename: str,
+                       digest: Optional[bytes] = None) -> Tuple[str, Optional[int], Optional[int]]:
+        """Save an in-memory image as PNG, returning its final filename and dimensions"""
+        filename, width, height, written = self._write_image(image_data, output_folder, filename, digest)
+        if written:
+            # Convert to PNG and cleanup original
+            filename = self._convert_to_png_and_cleanup(output_folder / filename).name
+            self._index_image(digest, output_folder, filename, width, height)
+        return filename, width, height
+
+    def _write_image(self, image_data: bytes, output_folder: Path, filename: str,
+                     digest: Optional[bytes] = None) -> Tuple[str, Optional[int], Optional[int], bool]:
+        """Save an in-memory image unconverted, returning its filename, dimensions and whether it still needs converting"""
+        # Bytes already saved for an earlier document are linked rather than written and converted again
+        if digest is not None and getattr(self._blob_local, 'pending', None) is not None:
+            linked = self._link_indexed_image(digest, output_folder, filename)
+            if linked is not None:
+                return (*linked, False)
+
+        # Dimensions come from the bytes already in memory, so the saved file is never reopened
+        width, height = _peek_dimensions(image_data)
+        _write_file(output_folder / filename, image_data)
+        return filename, width, height, True
+
+    def _convert_written_images(self, output_folder: Path, written: List[Tuple[ImageInfo, Optional[bytes]]]) -> None:
+        """Convert saved images to PNG concurrently, updating their ImageInfo to the final filename"""
+        paths = [output_folder / image.filename for image, _ in written]
+        # PIL and libvips release the GIL while decoding and encoding, so threads convert in parallel
+        workers = min(len(paths), config.IMAGE_EXTRACT_WORKERS)
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                final_paths = list(executor.map(self._convert_to_png_and_cleanup, paths))
+        else:
+            final_paths = [self._convert_to_png_and_cleanup(path) for path in paths]
 
-            # Look for r:embed attributes in the XML
-            import re
-            embed_pattern = r'r:embed="([^"]+)"'
-            matches = re.findall(embed_pattern, element_str)
-            embed_ids.extend(matches)
+        for (image, digest), final_path in zip(written, final_paths):
+            if final_path.name != image.filename:
+                image.url = image.url[:-len(image.filename)] + final_path.name
+                image.filename = final_path.name
+            self._index_image(digest, output_folder, image.filename, image.width, image.height)
 
-            # Also look for embed attributes without namespace prefix
-            embed_pattern2 = r'embed="([^"]+)"'
-            matches2 = re.findall(embed_pattern2, element_str)
-            embed_ids.extend(matches2)
+    def _index_image(self, digest: Optional[bytes], output_folder: Path, filename: str,
+                     width: Optional[int], height: Optional[int]) -> None:
+        """Queue a newly saved image for the blob index"""
+        pending = getattr(self._blob_local, 'pending', None)
+        if digest is not None and pending is not None:
+            pending.append((digest, output_folder.name, filename, width, height))
 
+    def _extract_embed_ids_from_drawing(self, drawing_element) -> List[str]:
+        """Extract embed IDs from a drawing element"""
+        embed_ids = []
+        try:
+            # Query the parsed element tree directly instead of serializing it and scanning the text
+            embed_ids = [str(embed_id) for embed_id in _EMBED_IDS_XPATH(drawing_element)]
         except Exception as e:
-            print(f"DEBUG: Error extracting embed IDs: {e}")
+            logger.debug("Error extracting embed IDs: %s", e)
 
         return embed_ids
 
     def _get_image_extension(self, image_data: bytes) -> str:
         """Determine image file extension from binary data"""
-        if image_data.startswith(b'\x89PNG'):
-            return 'png'
-        elif image_data.startswith(b'\xff\xd8\xff'):
-            return 'jpeg'
-        elif image_data.startswith(b'GIF'):
-            return 'gif'
-        elif image_data.startswith(b'BM'):
-            return 'bmp'
-        else:
-            return 'png'  # default fallback
+        # The first byte picks the single signature worth checking
+        magic = _IMAGE_MAGIC.get(image_data[0]) if image_data else None
+        if magic is not None and image_data.startswith(magic[0]):
+            return magic[1]
+        return 'png'  # default fallback
 
-    def _get_docx_context(self, paragraphs, current_idx: int) -> str:
+    def _get_docx_context(self, paragraph_texts: List[str], current_idx: int) -> str:
         """Extract text context around the current paragraph position"""
         context_range = 2  # Look 2 paragraphs before and after
         start_idx = max(0, current_idx - context_range)
-        end_idx = min(len(paragraphs), current_idx + context_range + 1)
+        end_idx = min(len(paragraph_texts), current_idx + context_range + 1)
 
         context_parts = []
-        for i in range(start_idx, end_idx):
-            if i < len(paragraphs):
-                text = paragraphs[i].text.strip()
-                if text and len(text) > 3:  # Only include meaningful text
-                    context_parts.append(text)
+        for text in paragraph_texts[start_idx:end_idx]:
+            text = text.strip()
+            if text and len(text) > 3:  # Only include meaningful text
+                context_parts.append(text)
 
         context = ' '.join(context_parts)
         return context[:200] if context else None  # Limit context length
 
-    def _estimate_content_position(self, paragraphs, current_idx: int) -> int:
-        """Estimate character position in the overall document content"""
-        position = 0
-        for i in range(current_idx):
-            if i < len(paragraphs):
-                position += len(paragraphs[i].text) + 1  # +1 for newline
-        return position
-
     def _extract_from_pptx(self, file_path: Path, output_folder: Path) -> List[ImageInfo]:
         """Extract images from PPTX files"""
-        images = []
-        try:
-            # PPTX files are ZIP archives
-            with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                for file_info in zip_ref.filelist:
-                    if file_info.filename.startswith('ppt/media/'):
-                        filename = Path(file_info.filename).name
-                        if filename.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff')):
-                            image_data = zip_ref.read(file_info.filename)
-                            temp_image_path = output_folder / filename
-
-                            with open(temp_image_path, 'wb') as f:
-                                f.write(image_data)
-
-                            # Convert to PNG and cleanup original
-                            final_image_path = self._convert_to_png_and_cleanup(temp_image_path)
-                            final_filename = final_image_path.name
-
-                            # Get image dimensions
-                            try:
-                                with Image.open(final_image_path) as img_obj:
-                                    width, height = img_obj.size
-                            except:
-                                width, height = None, None
-
-                            images.append(ImageInfo(
-                                filename=final_filename,
-                                url=f"{self.base_url}/images/{output_folder.name}/{final_filename}",
-                                width=width,
-                                height=height
-                            ))
-        except Exception as e:
-            print(f"Error extracting images from PPTX: {e}")
-
-        return images
+        return self._extract_from_zip_media(file_path, output_folder, ('ppt/media/',), 'PPTX')
 
     def _extract_from_excel(self, file_path: Path, output_folder: Path) -> List[ImageInfo]:
         """Extract images from Excel files"""
-        images = []
-        try:
-            # Excel files are ZIP archives
-            with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                for file_info in zip_ref.filelist:
-                    if file_info.filename.startswith('xl/media/'):
-                        filename = Path(file_info.filename).name
-                        if filename.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff')):
-                            image_data = zip_ref.read(file_info.filename)
-                            temp_image_path = output_folder / filename
-
-                            with open(temp_image_path, 'wb') as f:
-                                f.write(image_data)
-
-                            # Convert to PNG and cleanup original
-                            final_image_path = self._convert_to_png_and_cleanup(temp_image_path)
-                            final_filename = final_image_path.name
-
-                            # Get image dimensions
-                            try:
-                                with Image.open(final_image_path) as img_obj:
-                                    width, height = img_obj.size
-                            except:
-                                width, height = None, None
-
-                            images.append(ImageInfo(
-                                filename=final_filename,
-                                url=f"{self.base_url}/images/{output_folder.name}/{final_filename}",
-                                width=width,
-                                height=height
-                            ))
-        except Exception as e:
-            print(f"Error extracting images from Excel: {e}")
-
-        return images
+        return self._extract_from_zip_media(file_path, output_folder, ('xl/media/',), 'Excel')
 
     def _extract_from_odf(self, file_path: Path, output_folder: Path) -> List[ImageInfo]:
         """Extract images from ODF files (OpenDocument Format)"""
+        return self._extract_from_zip_media(file_path, output_folder, ('Pictures/',), 'ODF')
+
+    def _extract_from_zip_media(self, file_path: Path, output_folder: Path,
+                                prefixes: Tuple[str, ...], format_name: str) -> List[ImageInfo]:
+        """Extract the images stored under the given media folders of a ZIP-based document"""
         images = []
         try:
-            # ODF files are ZIP archives
-            with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                for file_info in zip_ref.filelist:
-                    if file_info.filename.startswith('Pictures/'):
-                        filename = Path(file_info.filename).name
-                        if filename.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff')):
-                            image_data = zip_ref.read(file_info.filename)
-                            temp_image_path = output_folder / filename
-
-                            with open(temp_image_path, 'wb') as f:
-                                f.write(image_data)
-
-                            # Convert to PNG and cleanup original
-                            final_image_path = self._convert_to_png_and_cleanup(temp_image_path)
-                            final_filename = final_image_path.name
-
-                            # Get image dimensions
-                            try:
-                                with Image.open(final_image_path) as img_obj:
-                                    width, height = img_obj.size
-                            except:
-                                width, height = None, None
-
-                            images.append(ImageInfo(
-                                filename=final_filename,
-                                url=f"{self.base_url}/images/{output_folder.name}/{final_filename}",
-                                width=width,
-                                height=height
-                            ))
+            # PPTX, XLSX and ODF files are ZIP archives
+            with self._open_zip(file_path) as zip_ref:
+                entries = []
+                for file_info in zip_ref.infolist():
+                    name = file_info.filename
+                    if not name.startswith(prefixes):
+                        continue
+                    filename = name.rpartition('/')[2]
+                    _, dot, ext = filename.rpartition('.')
+                    if not dot or ext.lower() not in _IMG_EXTS:
+                        continue
+                    entries.append((file_info, filename))
+                images = self._save_zip_entries(file_path, zip_ref, entries, output_folder)
         except Exception as e:
-            print(f"Error extracting images from ODF: {e}")
+            print(f"Error extracting images from {format_name}: {e}")
 
         return images
 
     def _extract_from_html_xml(self, file_path: Path, output_folder: Path) -> List[ImageInfo]:
         """Extract images referenced in HTML/XML files"""
         images = []
+        url_prefix = f"{self.base_url}/images/{output_folder.name}"
         try:
             # For HTML/XML, we would need to parse and download referenced images
-            # This is a basic implementation that looks for embedded base64 images
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Look for base64 embedded images
-            import re
-            import base64
-
-            pattern = r'data:image/([^;]+);base64,([^"]+)'
-            matches = re.findall(pattern, content)
-
-            for i, (image_type, base64_data) in enumerate(matches):
-                try:
-                    image_data = base64.b64decode(base64_data)
-                    temp_filename = f"embedded_image_{i + 1}.{image_type}"
-                    temp_image_path = output_folder / temp_filename
-
-                    with open(temp_image_path, 'wb') as f:
-                        f.write(image_data)
+            # This is a basic implementation that looks for embedded base64 images.
+            # The file is memory-mapped and scanned as raw bytes, so large documents are
+            # neither read into memory up front nor decoded from UTF-8 as a whole
+            with open(file_path, 'rb') as source:
+                if os.fstat(source.fileno()).st_size == 0:
+                    return images
+                content = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+
+            # The same data URL is often repeated (icons, bullets); save each distinct image once
+            saved_images = {}
+
+            with content, memoryview(content) as view:
+                # Look for base64 embedded images, decoding each match as it is found
+                for i, match in enumerate(_DATA_URL_RE.finditer(content)):
+                    image_type = match.group(1).decode('utf-8', errors='replace')
+                    try:
+                        # Decode straight from the mapped slice; base64.b64decode would
+                        # first copy the payload into a new bytes object
+                        image_data = _b64decode(view[match.start(2):match.end(2)])
+                        digest = hashlib.blake2b(image_data, digest_size=16).digest()
+                        if digest in saved_images:
+                            images.append(saved_images[digest].model_copy())
+                            continue
 
-                    # Convert to PNG and cleanup original
-                    final_image_path = self._convert_to_png_and_cleanup(temp_image_path)
-                    final_filename = final_image_path.name
+                        temp_filename = f"embedded_image_{i + 1}.{image_type}"
+                        final_filename, width, height = self._persist_image(
+                            image_data, output_folder, temp_filename, digest
+                        )
+                        if width is None:
+                            try:
+                                with _load_pil().open(output_folder / final_filename) as img_obj:
+                                    width, height = img_obj.size
+                            except:
+                                width, height = None, None
 
-                    # Get image dimensions
-                    try:
-                        with Image.open(final_image_path) as img_obj:
-                            width, height = img_obj.size
-                    except:
-                        width, height = None, None
-
-                    images.append(ImageInfo(
-                        filename=final_filename,
-                        url=f"{self.base_url}/images/{output_folder.name}/{final_filename}",
-                        width=width,
-                        height=height
-                    ))
-                except Exception as e:
-                    print(f"Error extracting embedded image: {e}")
+                        image_info = ImageInfo.model_construct(
+                            filename=final_filename,
+                            url=f"{url_prefix}/{final_filename}",
+                            width=width,
+                            height=height
+                        )
+                        saved_images[digest] = image_info
+                        images.append(image_info)
+                    except Exception as e:
+                        print(f"Error extracting embedded image: {e}")
 
         except Exception as e:
             print(f"Error processing HTML/XML file: {e}")
@@ -510,47 +953,175 @@ class ImageExtractor:
         """Extract images from archive files"""
         images = []
         try:
-            with zipfile.ZipFile(file_path, 'r') as zip_ref:
+            with self._open_zip(file_path) as zip_ref:
+                entries = []
                 for file_info in zip_ref.filelist:
-                    filename = Path(file_info.filename).name
-                    if filename.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.svg')):
-                        try:
-                            image_data = zip_ref.read(file_info.filename)
-                            safe_filename = "".join(c for c in filename if c.isalnum() or c in (' ', '-', '_', '.')).rstrip()
-                            temp_image_path = output_folder / safe_filename
-
-                            with open(temp_image_path, 'wb') as f:
-                                f.write(image_data)
-
-                            # Convert to PNG and cleanup original (skip SVG files)
-                            if not filename.lower().endswith('.svg'):
-                                final_image_path = self._convert_to_png_and_cleanup(temp_image_path)
-                                final_filename = final_image_path.name
-
-                                # Get image dimensions
-                                try:
-                                    with Image.open(final_image_path) as img_obj:
-                                        width, height = img_obj.size
-                                except:
-                                    width, height = None, None
-                            else:
-                                # Keep SVG files as-is (no conversion)
-                                final_filename = safe_filename
-                                width, height = None, None
-
-                            images.append(ImageInfo(
-                                filename=final_filename,
-                                url=f"{self.base_url}/images/{output_folder.name}/{final_filename}",
-                                width=width,
-                                height=height
-                            ))
-                        except Exception as e:
-                            print(f"Error extracting image from archive: {e}")
+                    filename = file_info.filename.rpartition('/')[2]
+                    _, dot, ext = filename.rpartition('.')
+                    if dot and ext.lower() in _ARCHIVE_IMG_EXTS:
+                        safe_filename = _UNSAFE_FILENAME_CHARS_RE.sub('', filename).rstrip()
+                        entries.append((file_info, safe_filename))
+                images = self._save_zip_entries(file_path, zip_ref, entries, output_folder)
         except Exception as e:
             print(f"Error processing archive file: {e}")
 
         return images
 
+    @contextlib.contextmanager
+    def _open_zip(self, file_path: Path):
+        """Open a ZIP-based document over a read-only memory map"""
+        # ZipFile issues many small reads for the central directory and local headers;
+        # over a memory map these are plain slices instead of read() syscalls
+        with open(file_path, 'rb', buffering=1 << 20) as raw:
+            try:
+                mapped = mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files can't be mapped; let ZipFile reject them as usual
+                mapped = None
+
+            if mapped is None:
+                with zipfile.ZipFile(raw, 'r') as zip_ref:
+                    yield zip_ref
+            else:
+                with mapped, zipfile.ZipFile(_MappedFile(mapped), 'r') as zip_ref:
+                    yield zip_ref
+
+    def _save_zip_entries(self, file_path: Path, zip_ref: zipfile.ZipFile,
+                          entries: List[Tuple[zipfile.ZipInfo, str]], output_folder: Path) -> List[ImageInfo]:
+        """Save archive entries concurrently, returning their ImageInfo in archive order"""
+        url_prefix = f"{self.base_url}/images/{output_folder.name}"
+
+        # A ZipFile serializes reads on its shared file handle, so each worker thread
+        # gets its own handle and the decompression streams don't contend for one lock
+        local = threading.local()
+        worker_handles = []
+
+        def worker_zip() -> zipfile.ZipFile:
+            if workers == 1:
+                return zip_ref
+            handle = getattr(local, 'zip_ref', None)
+            if handle is None:
+                # Memory-mapped archives hand each worker its own view of the same mapping
+                source = zip_ref.fp.view() if isinstance(zip_ref.fp, _MappedFile) else file_path
+                handle = local.zip_ref = zipfile.ZipFile(source, 'r')
+                worker_handles.append(handle)
+            return handle
+
+        def save(entry: Tuple[zipfile.ZipInfo, str]) -> Optional[ImageInfo]:
+            file_info, safe_name = entry
+            try:
+                return self._save_zip_entry(worker_zip(), file_info, output_folder, safe_name, url_prefix)
+            except Exception as e:
+                print(f"Error extracting image {file_info.filename}: {e}")
+                return None
+
+        # Entries from different folders can share a basename. Each gets its own target file here,
+        # before any worker starts, so one doesn't overwrite another and duplicates below
+        # point at the right bytes
+        entries = _unique_entry_names(entries)
+
+        # Identical media stored under several names share the CRC-32 and size recorded in the
+        # central directory. Entries sharing both are confirmed by a BLAKE2b digest of their bytes,
+        # and each confirmed duplicate reuses the ImageInfo of the first copy instead of a new file
+        candidates = {}
+        for index, (file_info, _) in enumerate(entries):
+            candidates.setdefault((file_info.CRC, file_info.file_size), []).append(index)
+
+        first_copy = {}
+        for indices in candidates.values():
+            if len(indices) < 2:
+                continue
+            digests = {}
+            for index in indices:
+                try:
+                    digest = self._zip_entry_digest(zip_ref, entries[index][0])
+                except Exception as e:
+                    print(f"Error reading image {entries[index][0].filename}: {e}")
+                    continue
+                first_copy[index] = digests.setdefault(digest, index)
+
+        unique_entries = [entry for index, entry in enumerate(entries) if first_copy.get(index, index) == index]
+        workers = max(1, min(len(unique_entries), config.IMAGE_EXTRACT_WORKERS))
+
+        if workers == 1:
+            unique_results = [save(entry) for entry in unique_entries]
+        else:
+            # Decompression, PNG encoding and disk writes all release the GIL,
+            # so entries can be handled in parallel
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    unique_results = list(executor.map(save, unique_entries))
+            finally:
+                for handle in worker_handles:
+                    handle.close()
+
+        # Rebuild the archive order, one ImageInfo per entry
+        saved = {}
+        unique_iter = iter(unique_results)
+        images = []
+        for index in range(len(entries)):
+            original = first_copy.get(index, index)
+            if original == index:
+                saved[index] = next(unique_iter)
+                image = saved[index]
+            else:
+                image = saved[original].model_copy() if saved[original] is not None else None
+            if image is not None:
+                images.append(image)
+        return images
+
+    @staticmethod
+    def _zip_entry_digest(zip_ref: zipfile.ZipFile, file_info: zipfile.ZipInfo) -> bytes:
+        """BLAKE2b digest of an archive entry's bytes, read in chunks"""
+        digest = hashlib.blake2b(digest_size=16)
+        with zip_ref.open(file_info, 'r') as src:
+            for chunk in iter(lambda: src.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.digest()
+
+    def _save_zip_entry(self, zip_ref: zipfile.ZipFile, file_info: zipfile.ZipInfo,
+                        output_folder: Path, safe_name: str, url_prefix: str) -> ImageInfo:
+        """Stream a single archive entry to the output folder and describe it as an ImageInfo"""
+        temp_image_path = output_folder / safe_name
+
+        # Copy the entry straight to disk instead of materializing it in memory first,
+        # keeping only the leading bytes around for the dimension lookup
+        with zip_ref.open(file_info, 'r') as src:
+            with open(temp_image_path, 'wb', buffering=1 << 20) as dst:
+                header = src.read(_HEADER_PEEK_SIZE)
+                dst.write(header)
+                shutil.copyfileobj(src, dst, length=1 << 20)
+
+            # Get image dimensions from the header bytes, falling back to PIL for
+            # formats the header parser doesn't handle (PIL only parses the header too)
+            width, height = _peek_dimensions(header)
+            if width is None:
+                try:
+                    # Rewind the open entry when possible rather than opening it again
+                    if src.seekable():
+                        src.seek(0)
+                        source = contextlib.nullcontext(src)
+                    else:
+                        source = zip_ref.open(file_info, 'r')
+                    with source as img_src, _load_pil().open(img_src) as img_obj:
+                        width, height = img_obj.size
+                except Exception:
+                    width, height = None, None
+
+        if safe_name.lower().endswith('.svg'):
+            # Keep SVG files as-is (no conversion)
+            final_filename = safe_name
+        else:
+            # Convert to PNG and cleanup original
+            final_filename = self._convert_to_png_and_cleanup(temp_image_path).name
+
+        return ImageInfo.model_construct(
+            filename=final_filename,
+            url=f"{url_prefix}/{final_filename}",
+            width=width,
+            height=height
+        )
+
     def cleanup_old_images(self, days_old: int) -> Dict[str, Any]:
         """
         Delete image folders that are older than the specified number of days.
@@ -575,25 +1146,43 @@ class ImageExtractor:
         deleted_folder_names = []
 
         try:
-            for folder_path in self.images_dir.iterdir():
-                if folder_path.is_dir():
-                    # Get folder creation time
-                    folder_stat = folder_path.stat()
-                    folder_creation_time = folder_stat.st_ctime
-
-                    if folder_creation_time < cutoff_time:
-                        # Calculate folder size before deletion
-                        folder_size = self._get_folder_size(folder_path)
-
-                        try:
-                            # Delete the folder and all its contents
-                            shutil.rmtree(folder_path)
-                            deleted_folders += 1
-                            freed_space_bytes += folder_size
-                            deleted_folder_names.append(folder_path.name)
-                            print(f"Deleted old image folder: {folder_path.name}")
-                        except Exception as e:
-                            print(f"Error deleting folder {folder_path.name}: {e}")
+            expired_folders = []
+            # scandir entries carry the file type from the directory listing and cache their stat.
+            # Symlinks are skipped here since _delete_folder refuses them anyway
+            with os.scandir(self.images_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        # Get folder creation time
+                        folder_creation_time = entry.stat().st_ctime
+
+                        if folder_creation_time < cutoff_time:
+                            expired_folders.append(Path(entry.path))
+
+            # Sizing and deleting are syscall-bound, so separate folders are removed concurrently
+            with ThreadPoolExecutor(max_workers=_CLEANUP_WORKERS) as executor:
+                futures = [executor.submit(self._delete_folder, folder_path) for folder_path in expired_folders]
+
+                # Images can be hard-linked across folders, so a file only frees space once all of
+                # its links are gone: {(device, inode): [size, link count, links removed]}
+                removed_files = {}
+                for folder_path, future in zip(expired_folders, futures):
+                    try:
+                        for file_id, size, nlink in future.result():
+                            removed = removed_files.setdefault(file_id, [size, nlink, 0])
+                            # The first lstat of a file precedes its first unlink, so the largest
+                            # link count seen is the count before cleanup started
+                            removed[1] = max(removed[1], nlink)
+                            removed[2] += 1
+                        deleted_folders += 1
+                        deleted_folder_names.append(folder_path.name)
+                        print(f"Deleted old image folder: {folder_path.name}")
+                    except Exception as e:
+                        print(f"Error deleting folder {folder_path.name}: {e}")
+
+            freed_space_bytes = sum(size for size, nlink, removed in removed_files.values() if removed >= nlink)
+
+            # Drop the blob index rows of deleted folders so the index doesn't outgrow the images
+            self._forget_blobs(deleted_folder_names)
 
             return {
                 "status": "completed",
@@ -611,40 +1200,57 @@ class ImageExtractor:
                 "freed_space_mb": round(freed_space_bytes / (1024 * 1024), 2)
             }
 
-    def _get_folder_size(self, folder_path: Path) -> int:
-        """Calculate the total size of a folder in bytes"""
-        total_size = 0
-        try:
-            for file_path in folder_path.rglob('*'):
-                if file_path.is_file():
-                    total_size += file_path.stat().st_size
-        except Exception as e:
-            print(f"Error calculating size for {folder_path}: {e}")
-        return total_size
+    def _delete_folder(self, folder_path: Path) -> List[Tuple[Tuple[int, int], int, int]]:
+        """Delete an image folder and all its contents, returning ((device, inode), size, link count) per file"""
+        # Like shutil.rmtree, refuse to follow a symlink and delete the contents of its target
+        if os.path.islink(folder_path):
+            raise OSError("Cannot delete a symbolic link")
+
+        # File stats are collected while deleting, so the folder is walked only once
+        removed_files = []
+        for root, dirs, files in os.walk(folder_path, topdown=False):
+            for name in files:
+                path = os.path.join(root, name)
+                file_stat = os.lstat(path)
+                removed_files.append(((file_stat.st_dev, file_stat.st_ino), file_stat.st_size, file_stat.st_nlink))
+                os.unlink(path)
+            for name in dirs:
+                path = os.path.join(root, name)
+                if os.path.islink(path):
+                    os.unlink(path)
+                else:
+                    os.rmdir(path)
+        os.rmdir(folder_path)
+        return removed_files
 
     def _convert_to_png_and_cleanup(self, image_path: Path) -> Path:
-        """Convert any image format to PNG and delete the original file"""
+        """Convert non-web image formats to PNG and delete the original file"""
         try:
+            suffix = image_path.suffix.lower()
             # If it's already a PNG, return as-is
-            if image_path.suffix.lower() == '.png':
+            if suffix == '.png':
                 return image_path
 
+            with open(image_path, 'rb') as image_file:
+                header = image_file.read(8)
+
+            # JPEG and GIF display natively in browsers, so keep them unless the content
+            # doesn't match the extension; re-encoding them would only cost time and size
+            if suffix in _NATIVE_IMAGE_SUFFIXES:
+                if self._get_image_extension(header) == _NATIVE_IMAGE_SUFFIXES[suffix]:
+                    return image_path
+
             # Create new PNG filename
             png_path = image_path.with_suffix('.png')
 
-            # Open and convert the image to PNG
-            with Image.open(image_path) as img:
-                # Convert to RGB if necessary (for formats like CMYK)
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    # Keep transparency for formats that support it
-                    img.save(png_path, 'PNG', optimize=True)
-                elif img.mode in ('CMYK', 'YCbCr'):
-                    # Convert CMYK and other modes to RGB first
-                    rgb_img = img.convert('RGB')
-                    rgb_img.save(png_path, 'PNG', optimize=True)
-                else:
-                    # For RGB and other modes, save directly
-                    img.save(png_path, 'PNG', optimize=True)
+            # Content that is already PNG under another extension only needs renaming
+            if header == b'\x89PNG\r\n\x1a\n':
+                image_path.replace(png_path)
+                return png_path
+
+            # libvips streams the conversion when available; PIL handles everything else
+            if not self._convert_with_pyvips(image_path, png_path):
+                self._convert_with_pil(image_path, png_path)
 
             # Delete the original file
             if image_path != png_path and image_path.exists():
@@ -657,3 +1263,40 @@ class ImageExtractor:
             print(f"Error converting {image_path} to PNG: {e}")
             # If conversion fails, return the original path
             return image_path
+
+    @staticmethod
+    def _convert_with_pyvips(image_path: Path, png_path: Path) -> bool:
+        """Convert an image to PNG with libvips, returning False if it isn't available or can't read it"""
+        vips = _load_pyvips()
+        if vips is None:
+            return False
+        try:
+            # Sequential access streams pixels through the pipeline instead of decoding the whole bitmap
+            img = vips.Image.new_from_file(str(image_path), access='sequential')
+            if img.interpretation == 'cmyk':
+                img = img.colourspace('srgb')
+            # Skipping the per-row filter search keeps encoding cheap
+            img.pngsave(str(png_path), compression=6, filter=vips.ForeignPngFilter.NONE)
+            return True
+        except vips.Error:
+            return False
+
+    @staticmethod
+    def _convert_with_pil(image_path: Path, png_path: Path) -> None:
+        """Convert an image to PNG with PIL"""
+        # Without oxipng to recompress the batch afterwards, PIL's own optimizer is still worth its cost
+        save_options = {} if _OXIPNG else {'optimize': True}
+
+        # Open and convert the image to PNG
+        with _load_pil().open(image_path) as img:
+            # Convert to RGB if necessary (for formats like CMYK)
+            if img.mode in ('RGBA', 'LA', 'P'):
+                # Keep transparency for formats that support it
+                img.save(png_path, 'PNG', **save_options)
+            elif img.mode in ('CMYK', 'YCbCr'):
+                # Convert CMYK and other modes to RGB first
+                rgb_img = img.convert('RGB')
+                rgb_img.save(png_path, 'PNG', **save_options)
+            else:
+                # For RGB and other modes, save directly
+                img.save(png_path, 'PNG', **save_options)
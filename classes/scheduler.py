@@ -1,8 +1,5 @@
 import asyncio
-import schedule
-import threading
-import time
-from datetime import datetime
+from datetime import datetime, time, timedelta
 from typing import Optional
 from classes.config import IMAGE_CLEANUP_DAYS, IMAGE_CLEANUP_TIME
 from classes.image_extractor import ImageExtractor
@@ -19,7 +16,9 @@ class ImageCleanupScheduler:
         self.image_extractor = image_extractor
         self.cleanup_days = IMAGE_CLEANUP_DAYS
         self.cleanup_time = IMAGE_CLEANUP_TIME
-        self.scheduler_thread: Optional[threading.Thread] = None
+        self.cleanup_at: Optional[time] = None
+        self.scheduler_task: Optional[asyncio.Task] = None
+        self.next_run: Optional[datetime] = None
         self.running = False
 
     def run_cleanup(self):
@@ -50,25 +49,17 @@ class ImageCleanupScheduler:
 
         # Validate cleanup time format
         try:
-            time_parts = self.cleanup_time.split(':')
-            if len(time_parts) != 2:
-                raise ValueError("Time format must be HH:MM")
-            hour, minute = int(time_parts[0]), int(time_parts[1])
-            if not (0 <= hour <= 23) or not (0 <= minute <= 59):
-                raise ValueError("Invalid time values")
+            self.cleanup_at = datetime.strptime(self.cleanup_time, "%H:%M").time()
         except ValueError as e:
             logger.error(f"Invalid cleanup time format '{self.cleanup_time}': {e}")
             logger.error("Using default time 02:00")
             self.cleanup_time = "02:00"
-
-        # Schedule the cleanup task
-        schedule.every().day.at(self.cleanup_time).do(self.run_cleanup)
+            self.cleanup_at = time(2, 0)
 
         self.running = True
 
-        # Start the scheduler in a separate thread
-        self.scheduler_thread = threading.Thread(target=self._run_scheduler, daemon=True)
-        self.scheduler_thread.start()
+        # Start the scheduler as a task on the application's event loop
+        self.scheduler_task = asyncio.create_task(self._run_scheduler())
 
         logger.info(f"Image cleanup scheduler started")
         logger.info(f"  - Cleanup time: {self.cleanup_time} daily")
@@ -84,30 +75,35 @@ class ImageCleanupScheduler:
             return
 
         self.running = False
-        schedule.clear()
+        self.next_run = None
 
-        if self.scheduler_thread and self.scheduler_thread.is_alive():
-            self.scheduler_thread.join(timeout=1.0)
+        if self.scheduler_task and not self.scheduler_task.done():
+            self.scheduler_task.cancel()
 
         logger.info("Image cleanup scheduler stopped")
 
-    def _run_scheduler(self):
+    async def _run_scheduler(self):
         """Internal method to run the scheduler loop"""
         while self.running:
             try:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
+                # Sleep once until the next daily cleanup time instead of polling the clock
+                now = datetime.now()
+                target = datetime.combine(now.date(), self.cleanup_at)
+                if target <= now:
+                    target += timedelta(days=1)
+                self.next_run = target
+                await asyncio.sleep((target - now).total_seconds())
+
+                # Cleanup does blocking file I/O, so keep it off the event loop
+                await asyncio.to_thread(self.run_cleanup)
             except Exception as e:
                 logger.error(f"Error in scheduler loop: {e}")
-                time.sleep(60)
+                await asyncio.sleep(60)
 
     def get_next_cleanup_time(self) -> Optional[str]:
         """Get the next scheduled cleanup time"""
-        jobs = schedule.get_jobs()
-        if jobs:
-            next_run = jobs[0].next_run
-            if next_run:
-                return next_run.strftime("%Y-%m-%d %H:%M:%S")
+        if self.next_run:
+            return self.next_run.strftime("%Y-%m-%d %H:%M:%S")
         return None
 
     def get_status(self) -> dict:
@@ -1,22 +1,133 @@
-import requests
+import asyncio
+import httpx
 import tempfile
+import io
 import os
 import re
 import base64
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Optional
 from urllib.parse import urlparse
 from pathlib import Path
 from markitdown import MarkItDown
 from fastapi import HTTPException
 from classes import ConvertResponse
-from classes.image_extractor import ImageExtractor
+from classes.image_extractor import ImageExtractor, shutdown_pdf_pool
 from classes.scheduler import ImageCleanupScheduler
 from classes.models import ImageInfo
+from classes.config import URL_CONVERT_CACHE_SIZE, FILE_CONVERT_CACHE_SIZE
 
 # Initialize MarkItDown and ImageExtractor
 md = MarkItDown()
 image_extractor = ImageExtractor()
 cleanup_scheduler = ImageCleanupScheduler(image_extractor)
 
+# Filename parameter of a Content-Disposition header
+_CD_FILENAME_RE = re.compile(r'filename[*]?=([^;]+)')
+
+# Browser-like User-Agent for URL downloads; some sites refuse unknown clients
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Pooled HTTP client shared by URL downloads, created on first use inside the event loop
+_http_client = None
+
+# httpx logs every request URL at INFO, and the app logs at INFO, so download URLs (including
+# signed or tokenised query strings) would end up in the logs; only let its warnings through
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# URL downloads up to this size are converted straight from memory; larger ones spill to a temporary file
+_URL_IN_MEMORY_LIMIT = 32 * 1024 * 1024
+
+# MarkItDown text of recent URL downloads, keyed by (SHA-256 of the bytes, filename), oldest first
+_url_convert_cache = OrderedDict()
+
+# MarkItDown text of recently converted local files, keyed by (path, mtime in ns, size), oldest first
+_file_convert_cache = OrderedDict()
+
+# Explicit page indicators within a lowercased line
+_PAGE_BREAK_INDICATOR_RE = re.compile(r'page |---|===|chapter |section ')
+
+# Heading cleanup kinds for _HEADING_PATTERNS
+_HEADING_PLAIN, _HEADING_NUMBERED, _HEADING_ROMAN, _HEADING_CENTERED, _HEADING_BOLD = range(5)
+
+# Patterns that indicate a heading/title (more restrictive), with how their heading text is cleaned up
+_HEADING_PATTERNS = (
+    # All caps text (common in titles) - but must be substantial and not contain common non-heading indicators
+    (r'^[A-Z][A-Z\s\d\-]{8,}[A-Z\d]$', _HEADING_PLAIN),
+    # Numbered sections (1. Title, 1.1 Title, etc.) - but not simple numbering
+    (r'^\d+(?:\.\d+)*\.?\s+[A-Z][A-Za-z\s]{3,}$', _HEADING_NUMBERED),
+    # Roman numerals
+    (r'^[IVX]+\.\s+[A-Z][A-Za-z\s]{3,}$', _HEADING_ROMAN),
+    # Centered text patterns (detected by surrounding whitespace)
+    (r'^\s{4,}[A-Z][A-Za-z\s\d\-.,!?()]{8,}\s{4,}$', _HEADING_CENTERED),
+    # Bold markers that might have been converted
+    (r'^\*\*([A-Z][A-Za-z\s\d\-.,!?()]{5,})\*\*$', _HEADING_BOLD),
+    # Underlined text patterns
+    (r'^[A-Z][A-Za-z\s\d\-.,!?()]{5,}$(?=\n[-=_]{4,})', _HEADING_PLAIN),
+)
+
+# All heading patterns as one alternation tried in order; the named group of a match identifies its pattern
+_HEADING_RE = re.compile('|'.join(f'(?P<h{i}>{pattern})' for i, (pattern, _) in enumerate(_HEADING_PATTERNS)))
+_HEADING_KINDS = {f'h{i}': kind for i, (_, kind) in enumerate(_HEADING_PATTERNS)}
+
+# Patterns that should NOT be treated as headings
+_EXCLUSION_PATTERNS = (
+    # Names with titles (Prof., Dr., Mr., Ms., etc.)
+    r'^(Prof\.?|Dr\.?|Mr\.?|Ms\.?|Mrs\.?)\s+',
+    # Email addresses or lines containing emails
+    r'@.*\.',
+    # URLs or lines containing URLs
+    r'(https?://|www\.|\.com|\.org|\.net)',
+    # Contact information patterns
+    r'^(Phone|Tel|Email|Fax|Address|Office):?\s*',
+    # Course/class information - more specific pattern that requires colon or specific context
+    r'^(Course|Class|Section|Semester|Room|Time|Day|Location)\s*:',
+    # Lines that end with colons (field labels)
+    r'^[^:]{1,30}:\s*',
+    # Lines with specific academic/contact keywords
+    r'(phone|email|office|room|building|semester|lecture|tutorial|lab)',
+    # Zoom/meeting links
+    r'(zoom|meeting|conference)',
+    # Lines that are clearly data/values rather than headings
+    r'^[A-Z][a-z]+\s+\d{4}',  # Month Year
+    r'^\d+:\d+\s*(AM|PM)',     # Time formats
+    r'^[A-Z][a-z]+,\s*\d',    # Day, date formats
+)
+
+# Exclusion patterns as one alternation, so each line is searched once; the unanchored ones carry no
+# leading or trailing '.*', which only made the engine backtrack over every start position
+_EXCLUSION_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in _EXCLUSION_PATTERNS), re.IGNORECASE)
+
+# Heading text cleanup for bold, numbered and roman numeral headings
+_BOLD_RE = re.compile(r'^\*\*([^*]+)\*\*$')
+_NUMBER_PREFIX_RE = re.compile(r'^\d+(?:\.\d+)*\.?\s+')
+_ROMAN_PREFIX_RE = re.compile(r'^[IVX]+\.\s+')
+
+# Standalone title heuristics
+_SENTENCE_WORD_RE = re.compile(r'\b(the|a|an|and|or|but|in|on|at|to|for|of|with|by)\b')
+_YEAR_RE = re.compile(r'\d{4}')
+_WEEKDAY_RE = re.compile(r'(monday|tuesday|wednesday|thursday|friday|saturday|sunday)')
+_TITLE_CASE_RE = re.compile(r'^[A-Z][A-Za-z]+(?:\s+[A-Z][A-Za-z]+)*$')
+
+# The same H1 heading repeated on consecutive lines
+_DUP_HEADING_RE = re.compile(r'\n# ([^\n]+)\n# \1\n')
+
+def _heading_line(original_line: str, heading_text: str, underline: str = "") -> str:
+    """
+    Format an H1 heading line. Form feeds that stripping removed from the original line
+    (or its consumed underline) are put back, since they mark the PDF page boundaries
+    that _add_page_numbers_to_markdown splits on.
+    """
+    if '\f' not in original_line and '\f' not in underline:
+        return f"# {heading_text}"
+
+    text = original_line.lstrip()
+    leading = original_line[:len(original_line) - len(text)].count('\f')
+    trailing = text[len(text.rstrip()):].count('\f') + underline.count('\f')
+    return '\f' * leading + f"# {heading_text}" + '\f' * trailing
+
 def _enhance_heading_detection(content: str, file_path: str = None) -> str:
     """
     Enhance heading detection by converting various title patterns to H1 headings.
@@ -29,165 +140,125 @@ def _enhance_heading_detection(content: str, file_path: str = None) -> str:
     lines = content.split('\n')
     processed_lines = []
 
-    # Patterns that indicate a heading/title (more restrictive)
-    heading_patterns = [
-        # All caps text (common in titles) - but must be substantial and not contain common non-heading indicators
-        r'^[A-Z][A-Z\s\d\-]{8,}[A-Z\d]$',
-        # Numbered sections (1. Title, 1.1 Title, etc.) - but not simple numbering
-        r'^\d+(?:\.\d+)*\.?\s+[A-Z][A-Za-z\s]{3,}$',
-        # Roman numerals
-        r'^[IVX]+\.\s+[A-Z][A-Za-z\s]{3,}$',
-        # Centered text patterns (detected by surrounding whitespace)
-        r'^\s{4,}[A-Z][A-Za-z\s\d\-.,!?()]{8,}\s{4,}$',
-        # Bold markers that might have been converted
-        r'^\*\*([A-Z][A-Za-z\s\d\-.,!?()]{5,})\*\*$',
-        # Underlined text patterns
-        r'^[A-Z][A-Za-z\s\d\-.,!?()]{5,}$(?=\n[-=_]{4,})',
-    ]
+    # Single forward pass; the previous stripped line is carried over and the next one is looked up
+    # only for lines that reach the title heuristics
+    last_index = len(lines) - 1
+    line = ""
+    skip_underline = False
 
-    # Patterns that should NOT be treated as headings
-    exclusion_patterns = [
-        # Names with titles (Prof., Dr., Mr., Ms., etc.)
-        r'^(Prof\.?|Dr\.?|Mr\.?|Ms\.?|Mrs\.?)\s+',
-        # Email addresses or lines containing emails
-        r'.*@.*\..*',
-        # URLs or lines containing URLs
-        r'.*(https?://|www\.|\.com|\.org|\.net)',
-        # Contact information patterns
-        r'^(Phone|Tel|Email|Fax|Address|Office):?\s*',
-        # Course/class information - more specific pattern that requires colon or specific context
-        r'^(Course|Class|Section|Semester|Room|Time|Day|Location)\s*:',
-        # Lines that end with colons (field labels)
-        r'^[^:]{1,30}:\s*',
-        # Lines with specific academic/contact keywords
-        r'.*(phone|email|office|room|building|semester|lecture|tutorial|lab).*',
-        # Zoom/meeting links
-        r'.*(zoom|meeting|conference).*',
-        # Lines that are clearly data/values rather than headings
-        r'^[A-Z][a-z]+\s+\d{4}',  # Month Year
-        r'^\d+:\d+\s*(AM|PM)',     # Time formats
-        r'^[A-Z][a-z]+,\s*\d',    # Day, date formats
-    ]
+    for i, original_line in enumerate(lines):
+        prev_line, line = line, original_line.strip()
 
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        original_line = lines[i]
+        # Underline already consumed by the heading above it
+        if skip_underline:
+            skip_underline = False
+            continue
 
         # Skip if already a markdown heading
         if line.startswith('#'):
             processed_lines.append(original_line)
-            i += 1
             continue
 
         # Skip empty lines
         if not line:
             processed_lines.append(original_line)
-            i += 1
             continue
 
         # Check exclusion patterns first
-        is_excluded = False
-        for exclusion_pattern in exclusion_patterns:
-            if re.search(exclusion_pattern, line, re.IGNORECASE):
-                is_excluded = True
-                break
+        is_excluded = _EXCLUSION_RE.search(line) is not None
 
         if is_excluded:
             processed_lines.append(original_line)
-            i += 1
             continue
 
         is_heading = False
         heading_text = line
 
-        # Check each heading pattern
-        for pattern in heading_patterns:
-            if re.match(pattern, line):
-                is_heading = True
-                # Extract clean heading text for some patterns
-                if pattern.endswith(r'\*\*$'):  # Bold pattern
-                    match = re.match(r'^\*\*([^*]+)\*\*$', line)
-                    if match:
-                        heading_text = match.group(1)
-                elif pattern.startswith(r'^\d+'):  # Numbered sections
-                    # Remove numbering prefix
-                    heading_text = re.sub(r'^\d+(?:\.\d+)*\.?\s+', '', line)
-                elif pattern.startswith(r'^[IVX]+'):  # Roman numerals
-                    heading_text = re.sub(r'^[IVX]+\.\s+', '', line)
-                elif r'\s{4,}' in pattern:  # Centered text
-                    heading_text = line.strip()
-                break
+        # Check the heading patterns in a single match
+        match = _HEADING_RE.match(line)
+        if match:
+            is_heading = True
+            kind = _HEADING_KINDS[match.lastgroup]
+            # Extract clean heading text for some patterns
+            if kind == _HEADING_BOLD:  # Bold pattern
+                bold_match = _BOLD_RE.match(line)
+                if bold_match:
+                    heading_text = bold_match.group(1)
+            elif kind == _HEADING_NUMBERED:  # Numbered sections
+                # Remove numbering prefix
+                heading_text = _NUMBER_PREFIX_RE.sub('', line)
+            elif kind == _HEADING_ROMAN:  # Roman numerals
+                heading_text = _ROMAN_PREFIX_RE.sub('', line)
+            elif kind == _HEADING_CENTERED:  # Centered text
+                heading_text = line.strip()
 
         # Additional heuristics for Word document titles (more restrictive)
+        next_line = ""
         if not is_heading and line and not is_excluded:
             # Check if this looks like a standalone title
-            next_line = lines[i + 1].strip() if i + 1 < len(lines) else ""
-            prev_line = lines[i - 1].strip() if i > 0 else ""
+            next_line = lines[i + 1].strip() if i < last_index else ""
+            # Word split and lowercase form shared by the checks below
+            words = line.split()
+            line_lower = line.lower()
 
             # More restrictive standalone title detection
             if (len(line) < 60 and  # Not too long
-                len(line.split()) >= 2 and len(line.split()) <= 8 and  # Reasonable word count for title
+                len(words) >= 2 and len(words) <= 8 and  # Reasonable word count for title
                 line[0].isupper() and  # Starts with capital
                 not line.endswith('.') and  # Doesn't end with period (not a sentence)
                 not line.endswith(',') and  # Doesn't end with comma
                 not line.endswith(':') and  # Doesn't end with colon (not a label)
                 (not next_line or next_line == "" or not next_line[0].islower()) and  # Next line doesn't continue sentence
                 prev_line == "" and  # Previous line is empty (standalone)
-                not re.search(r'\b(the|a|an|and|or|but|in|on|at|to|for|of|with|by)\b', line.lower()) and  # Avoid common sentence words
-                not re.search(r'\d{4}', line) and  # Avoid years/dates
-                not re.search(r'(monday|tuesday|wednesday|thursday|friday|saturday|sunday)', line.lower())):  # Avoid days
+                not _SENTENCE_WORD_RE.search(line_lower) and  # Avoid common sentence words
+                not _YEAR_RE.search(line) and  # Avoid years/dates
+                not _WEEKDAY_RE.search(line_lower)):  # Avoid days
 
                 # Additional check for title-like content
-                words = line.split()
                 if all(word[0].isupper() or word.lower() in ['of', 'the', 'and', 'in', 'to', 'for'] for word in words):
                     is_heading = True
 
             # Special case: Common section titles in academic documents
-            elif (len(line.split()) >= 2 and len(line.split()) <= 4 and
+            elif (len(words) >= 2 and len(words) <= 4 and
                   line[0].isupper() and
                   prev_line == "" and  # Previous line is empty (standalone)
-                  re.match(r'^[A-Z][A-Za-z]+(?:\s+[A-Z][A-Za-z]+)*$', line) and  # Title case - more flexible pattern
-                  line.lower() in ['course information', 'course description', 'learning outcomes',
+                  _TITLE_CASE_RE.match(line) and  # Title case - more flexible pattern
+                  line_lower in ['course information', 'course description', 'learning outcomes',
                                    'required texts', 'course objectives', 'grading scheme',
                                    'assignment details', 'tutorial information', 'office hours']):
                 is_heading = True
 
         # Check for underlined headings (text followed by dashes, equals, etc.)
-        if not is_heading and not is_excluded and i + 1 < len(lines):
-            next_line = lines[i + 1].strip()
+        if not is_heading and not is_excluded and i < last_index:
             if (next_line and
                 len(next_line) >= 4 and
-                all(c in '-=_' for c in next_line) and
+                not next_line.strip('-=_') and  # Only underline characters
                 abs(len(next_line) - len(line)) <= 5 and  # Underline length roughly matches text
                 len(line) >= 5):  # Minimum length for heading
                 is_heading = True
                 # Skip the underline in next iteration
-                processed_lines.append(f"# {heading_text}")
-                i += 2  # Skip both current line and underline
+                processed_lines.append(_heading_line(original_line, heading_text, lines[i + 1]))
+                skip_underline = True  # Skip both current line and underline
                 continue
 
         # Convert to H1 heading if identified as heading
         if is_heading:
-            processed_lines.append(f"# {heading_text}")
+            processed_lines.append(_heading_line(original_line, heading_text))
         else:
             processed_lines.append(original_line)
 
-        i += 1
-
     # Join the processed lines
     enhanced_content = '\n'.join(processed_lines)
 
     # Additional cleanup: Remove duplicate headings
-    enhanced_content = re.sub(r'\n# ([^\n]+)\n# \1\n', r'\n# \1\n', enhanced_content)
+    enhanced_content = _DUP_HEADING_RE.sub(r'\n# \1\n', enhanced_content)
 
     return enhanced_content
 
-def _extract_pdf_hyperlinks(file_path: str) -> dict:
-    """Extract hyperlinks from PDF files using specialized libraries"""
+def _extract_pdf_hyperlinks_pymupdf(file_path: str) -> Optional[dict]:
+    """Extract PDF hyperlinks with PyMuPDF; None if it is unavailable or fails"""
     hyperlinks = {}
 
-    # Try with PyMuPDF (fitz) first - most robust
     try:
         import fitz  # PyMuPDF
 
@@ -212,11 +283,17 @@ def _extract_pdf_hyperlinks(file_path: str) -> dict:
         doc.close()
 
     except ImportError:
-        pass
+        return None
     except Exception as e:
         print(f"Error extracting hyperlinks with PyMuPDF: {e}")
+        return None
+
+    return hyperlinks
+
+def _extract_pdf_hyperlinks_pypdf2(file_path: str) -> Optional[dict]:
+    """Extract PDF hyperlinks with PyPDF2; None if it is unavailable or fails"""
+    hyperlinks = {}
 
-    # Try with PyPDF2 as fallback
     try:
         import PyPDF2
 
@@ -236,7 +313,7 @@ def _extract_pdf_hyperlinks(file_path: str) -> dict:
                                     if "/URI" in action:
                                         uri = str(action["/URI"])
 
-                                        # Only add if not already found by PyMuPDF
+                                        # Keep the first annotation for each URI
                                         if uri not in hyperlinks:
                                             hyperlinks[uri] = {
                                                 'url': uri,
@@ -247,11 +324,17 @@ def _extract_pdf_hyperlinks(file_path: str) -> dict:
                                 continue
 
     except ImportError:
-        pass
+        return None
     except Exception as e:
         print(f"Error extracting hyperlinks with PyPDF2: {e}")
+        return None
+
+    return hyperlinks
+
+def _extract_pdf_hyperlinks_pdfplumber(file_path: str) -> Optional[dict]:
+    """Extract PDF hyperlinks with pdfplumber; None if it is unavailable or fails"""
+    hyperlinks = {}
 
-    # Try with pdfplumber as final fallback
     try:
         import pdfplumber
 
@@ -288,12 +371,28 @@ def _extract_pdf_hyperlinks(file_path: str) -> dict:
                                     }
 
     except ImportError:
-        pass
+        return None
     except Exception as e:
         print(f"Error extracting hyperlinks with pdfplumber: {e}")
+        return None
 
     return hyperlinks
 
+def _extract_pdf_hyperlinks(file_path: str) -> dict:
+    """Extract hyperlinks from PDF files using specialized libraries"""
+    # PyMuPDF first - most robust; the fallbacks only run when a library is missing or fails on the file,
+    # since a library that reads the file already sees every link annotation
+    for extract in (_extract_pdf_hyperlinks_pymupdf, _extract_pdf_hyperlinks_pypdf2, _extract_pdf_hyperlinks_pdfplumber):
+        hyperlinks = extract(file_path)
+        if hyperlinks is not None:
+            return hyperlinks
+
+    return {}
+
+# Letters kept from URL path segments when guessing link terms, and words of the content they are checked against
+_NON_LETTER_RE = re.compile(r'[^a-zA-Z]')
+_WORD_RE = re.compile(r'\w+')
+
 def _integrate_pdf_hyperlinks(content: str, hyperlinks: dict) -> str:
     """Integrate extracted PDF hyperlinks into the markdown content"""
     if not hyperlinks:
@@ -301,6 +400,7 @@ def _integrate_pdf_hyperlinks(content: str, hyperlinks: dict) -> str:
 
     # Create a clean mapping of terms to URLs
     term_to_url = {}
+    content_words = None
 
     for url, link_data in hyperlinks.items():
         url_clean = str(url).strip()
@@ -317,41 +417,62 @@ def _integrate_pdf_hyperlinks(content: str, hyperlinks: dict) -> str:
             for part in url_parts:
                 if part and len(part) > 4:
                     # Clean the part and check if it might be a term
-                    clean_part = re.sub(r'[^a-zA-Z]', '', part)
+                    clean_part = _NON_LETTER_RE.sub('', part)
                     if len(clean_part) > 4 and clean_part.lower() not in ['https', 'www', 'com', 'org', 'html']:
-                        # Check if this term appears in the content
-                        if re.search(r'\b' + re.escape(clean_part) + r'\b', content, re.IGNORECASE):
+                        # Check if this term appears in the content as a whole word; the words are
+                        # collected once rather than searching the content again for every URL
+                        if content_words is None:
+                            content_words = {word.lower() for word in _WORD_RE.findall(content)}
+                        if clean_part.lower() in content_words:
                             term_to_url[clean_part] = url_clean
                             break
 
-    # Apply the mappings carefully to avoid nested replacements
-    for term, url in term_to_url.items():
-        # Create a pattern that matches the exact term as a whole word
-        pattern = r'\b' + re.escape(term) + r'\b'
+    if not term_to_url:
+        return content
 
-        # Check if the term exists and is not already a link
-        matches = list(re.finditer(pattern, content, re.IGNORECASE))
+    # Apply all mappings in one pass over the content, matching every term as a whole word;
+    # the alternatives keep the mapping order so the first of two case variants wins
+    terms = list(term_to_url.items())
+    pattern = re.compile(
+        r'\b(?:' + '|'.join(f'(?P<t{index}>{re.escape(term)})' for index, (term, _) in enumerate(terms)) + r')\b',
+        re.IGNORECASE
+    )
+
+    parts = []
+    position = 0
+    for match in pattern.finditer(content):
+        start, end = match.span()
+
+        # Check if this word is already part of a markdown link
+        # Look backwards for [ and forwards for ]( to detect existing links
+        before_context = content[max(0, start-10):start]
+        after_context = content[end:end+10]
 
-        for match in reversed(matches):  # Reverse to avoid position shifts
-            start, end = match.span()
+        # Skip if already part of a link
+        if '[' in before_context and not ']' in before_context:
+            continue
+        if '](' in after_context:
+            continue
 
-            # Check if this word is already part of a markdown link
-            # Look backwards for [ and forwards for ]( to detect existing links
-            before_context = content[max(0, start-10):start]
-            after_context = content[end:end+10]
+        # Replace this occurrence
+        original_word = match.group(0)
+        url = terms[int(match.lastgroup[1:])][1]
+        parts.append(content[position:start])
+        parts.append(f'[{original_word}]({url})')
+        position = end
 
-            # Skip if already part of a link
-            if '[' in before_context and not ']' in before_context:
-                continue
-            if '](' in after_context:
-                continue
+    if not parts:
+        return content
 
-            # Replace this occurrence
-            original_word = match.group(0)
-            replacement = f'[{original_word}]({url})'
-            content = content[:start] + replacement + content[end:]
+    parts.append(content[position:])
+    return ''.join(parts)
 
-    return content
+# Hyperlink conversion patterns. Each pass is skipped when the literal text its pattern
+# requires is absent, which is the common case for plain documents
+_HTML_LINK_RE = re.compile(r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>([^<]*)</a>', re.IGNORECASE)
+_BARE_URL_RE = re.compile(r'(?<!\[)(?<!\()(?<!\]\()(?:https?://|www\.)[\w\-._~:/?#[\]@!$&\'()*+,;=]+(?!\))')
+_EMAIL_RE = re.compile(r'(?<!\[)(?<!\()(?<!\]\()[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}(?!\))')
+_DOUBLE_PROTOCOL_RE = re.compile(r'\[([^\]]*)\]\(https?://https?://([^)]*)\)')
 
 def _convert_hyperlinks_to_markdown(content: str) -> str:
     """Convert various hyperlink formats to proper Markdown URLs"""
@@ -360,13 +481,11 @@ def _convert_hyperlinks_to_markdown(content: str) -> str:
 
     # Pattern 1: Convert HTML anchor tags to Markdown links
     # <a href="url">text</a> -> [text](url)
-    html_link_pattern = r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>([^<]*)</a>'
-    content = re.sub(html_link_pattern, r'[\2](\1)', content, flags=re.IGNORECASE)
+    if '<a' in content or '<A' in content:
+        content = _HTML_LINK_RE.sub(r'[\2](\1)', content)
 
     # Pattern 2: Convert bare URLs to Markdown links (but avoid URLs already in markdown links)
     # Only convert URLs that are not already in Markdown format
-    url_pattern = r'(?<!\[)(?<!\()(?<!\]\()(?:https?://|www\.)[\w\-._~:/?#[\]@!$&\'()*+,;=]+(?!\))'
-
     def url_replacer(match):
         url = match.group(0)
         # Check if this URL is already part of a markdown link by looking at context
@@ -383,12 +502,11 @@ def _convert_hyperlinks_to_markdown(content: str) -> str:
         # Use the URL as both the text and the link
         return f'[{url}]({url})'
 
-    content = re.sub(url_pattern, url_replacer, content)
+    if 'http' in content or 'www.' in content:
+        content = _BARE_URL_RE.sub(url_replacer, content)
 
     # Pattern 3: Convert email addresses to Markdown links
     # email@domain.com -> [email@domain.com](mailto:email@domain.com)
-    email_pattern = r'(?<!\[)(?<!\()(?<!\]\()[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}(?!\))'
-
     def email_replacer(match):
         email = match.group(0)
         # Check context to avoid double-processing
@@ -398,11 +516,13 @@ def _convert_hyperlinks_to_markdown(content: str) -> str:
             return email
         return f'[{email}](mailto:{email})'
 
-    content = re.sub(email_pattern, email_replacer, content)
+    if '@' in content:
+        content = _EMAIL_RE.sub(email_replacer, content)
 
     # Pattern 4: Clean up any malformed links (remove this aggressive fix)
     # Instead, just fix obvious protocol duplications
-    content = re.sub(r'\[([^\]]*)\]\(https?://https?://([^)]*)\)', r'[\1](https://\2)', content)
+    if '://http' in content:
+        content = _DOUBLE_PROTOCOL_RE.sub(r'[\1](https://\2)', content)
 
     return content
 
@@ -414,100 +534,87 @@ def _add_page_numbers_to_markdown(content: str, file_path: str = None, create_pa
     # Check if this is a PDF file (most likely to have pages)
     is_pdf = file_path and Path(file_path).suffix.lower() == '.pdf'
 
-    # Common patterns that indicate page breaks in converted content
-    page_break_patterns = [
-        r'\n\s*\n\s*(?=\w)',  # Double newlines followed by content
-        r'\f',  # Form feed character
-        r'(?i)page\s*\d+',  # Existing page references
-        r'(?i)\\page',  # LaTeX page breaks
-    ]
+    # Form feeds mark real page boundaries (the PDF text extraction emits one after
+    # every page), so split on them and only fall back to heuristics without them
+    if '\f' in content:
+        pages = content.split('\f')
+        result_pages = []
+        for i, page_content in enumerate(pages):
+            if page_content.strip():
+                result_pages.append(f"## Page {i + 1}\n\n{page_content.strip()}")
+        return '\n\n---\n\n'.join(result_pages)
 
     # For PDF files, we can be more aggressive about detecting pages
     if is_pdf:
         # Split content into potential pages based on common patterns
         # Look for sections that might represent page breaks
         lines = content.split('\n')
-        processed_lines = []
+        # Blank-line test computed once per line; the checks below only index this list
+        blank = [not line or line.isspace() for line in lines]
+        last_with_lookahead = len(lines) - 3
         page_number = 1
         line_count = 0
+        segment_start = 0
 
-        # Add first page marker
-        processed_lines.append(f"## Page {page_number}")
-        processed_lines.append("")
+        # Add first page marker; lines between breaks are joined as whole segments
+        processed_parts = [f"## Page {page_number}\n"]
 
-        for i, line in enumerate(lines):
+        for i, is_blank in enumerate(blank):
             line_count += 1
-            processed_lines.append(line)
 
             # Detect potential page breaks based on content patterns
-            should_add_page_break = False
-
-            # Method 1: Large gaps in content (multiple empty lines)
-            if (line.strip() == '' and
-                i < len(lines) - 2 and
-                lines[i + 1].strip() == '' and
-                lines[i + 2].strip() != '' and
-                line_count > 20):  # Only after substantial content
-                should_add_page_break = True
+            if is_blank:
+                # Method 3: Long content sections (rough estimate)
+                # Method 1: Large gaps in content (multiple empty lines), only after substantial content
+                if not (line_count > 50 or
+                        (line_count > 20 and
+                         i <= last_with_lookahead and
+                         blank[i + 1] and
+                         not blank[i + 2])):
+                    continue
 
             # Method 2: Detect headers that might indicate new pages
-            elif (line.strip().startswith('#') and
-                  line_count > 30 and
-                  i > 0 and
-                  lines[i - 1].strip() == ''):
-                should_add_page_break = True
-
-            # Method 3: Long content sections (rough estimate)
-            elif line_count > 50 and line.strip() == '':
-                should_add_page_break = True
+            elif not (line_count > 30 and
+                      i > 0 and
+                      blank[i - 1] and
+                      lines[i].lstrip().startswith('#')):
+                continue
 
-            if should_add_page_break:
-                page_number += 1
-                processed_lines.append("")
-                processed_lines.append("---")
-                processed_lines.append("")
-                processed_lines.append(f"## Page {page_number}")
-                processed_lines.append("")
-                line_count = 0
+            page_number += 1
+            processed_parts.append('\n'.join(lines[segment_start:i + 1]))
+            processed_parts.append(f"\n---\n\n## Page {page_number}\n")
+            segment_start = i + 1
+            line_count = 0
 
-        return '\n'.join(processed_lines)
+        if segment_start < len(lines):
+            processed_parts.append('\n'.join(lines[segment_start:]))
+        return '\n'.join(processed_parts)
 
     # For non-PDF files, use simpler page detection
-    else:
-        # Look for explicit page markers or form feeds
-        if '\f' in content:
-            pages = content.split('\f')
-            result_pages = []
-            for i, page_content in enumerate(pages):
-                if page_content.strip():
-                    result_pages.append(f"## Page {i + 1}\n\n{page_content.strip()}")
-            return '\n\n---\n\n'.join(result_pages)
-
-        # Check for very long content that might benefit from page markers
+    # Check for very long content that might benefit from page markers; counting newlines
+    # first means short documents are returned without being split at all
+    elif content.count('\n') >= 100:  # Long documents (more than 100 lines)
         lines = content.split('\n')
-        if len(lines) > 100:  # Long documents
-            processed_lines = []
-            page_number = 1
-            line_count = 0
+        page_number = 1
+        line_count = 0
+        segment_start = 0
 
-            processed_lines.append(f"## Page {page_number}")
-            processed_lines.append("")
+        processed_parts = [f"## Page {page_number}\n"]
 
-            for line in lines:
-                line_count += 1
-                processed_lines.append(line)
+        for i, line in enumerate(lines):
+            line_count += 1
 
-                # Add page breaks for very long content
-                if line_count > 80 and line.strip() == '':
-                    page_number += 1
-                    processed_lines.append("")
-                    processed_lines.append("---")
-                    processed_lines.append("")
-                    processed_lines.append(f"## Page {page_number}")
-                    processed_lines.append("")
-                    line_count = 0
+            # Add page breaks for very long content
+            if line_count > 80 and (not line or line.isspace()):
+                page_number += 1
+                processed_parts.append('\n'.join(lines[segment_start:i + 1]))
+                processed_parts.append(f"\n---\n\n## Page {page_number}\n")
+                segment_start = i + 1
+                line_count = 0
 
-            return '\n'.join(processed_lines)
+        if segment_start < len(lines):
+            processed_parts.append('\n'.join(lines[segment_start:]))
+        return '\n'.join(processed_parts)
 
     return content
 
@@ -519,6 +626,10 @@ def stop_cleanup_scheduler():
     """Stop the image cleanup scheduler"""
     cleanup_scheduler.stop_scheduler()
 
+def shutdown_pdf_workers():
+    """Stop the worker processes used to extract images from large PDFs"""
+    shutdown_pdf_pool()
+
 def get_cleanup_status():
     """Get the status of the cleanup scheduler"""
     return cleanup_scheduler.get_status()
@@ -540,38 +651,65 @@ def _integrate_images_into_markdown(content: str, images: list) -> str:
 
     # Create a mapping of page numbers to images
     page_to_images = {}
+    # Context words are fixed per image, so split them once instead of on every line
+    image_context_words = {}
     for image in sorted_images:
         page_num = image.page_number or 1
         if page_num not in page_to_images:
             page_to_images[page_num] = []
         page_to_images[page_num].append(image)
+        if image.content_context:
+            image_context_words[id(image)] = image.content_context.lower().split()
 
     # Track which images have been placed
     placed_images = set()
     current_page = 1
+    lowered_lines = None
+
+    # Each line is stripped once; blank flags for the neighbouring lines slide along with it
+    last_index = len(lines) - 1
+    previous_blank = False
+    next_blank = not lines[0] or lines[0].isspace()
 
     for i, line in enumerate(lines):
         processed_lines.append(line)
+        line_stripped = line.strip()
+        line_blank = next_blank
+        next_blank = i < last_index and (not lines[i + 1] or lines[i + 1].isspace())
 
         # Detect page breaks in content
-        if _is_page_break_indicator(line, lines, i):
+        if _is_page_break_indicator(line_stripped, line_blank,
+                                    i > 0 and previous_blank,
+                                    i < last_index and not next_blank):
             current_page += 1
+        previous_blank = line_blank
 
         # Try to place images based on content context matching
         if current_page in page_to_images:
+            surrounding_text = None
             for image in page_to_images[current_page]:
                 if image.filename in placed_images:
                     continue
 
+                context_words = image_context_words.get(id(image))
+                if not context_words:
+                    continue
+
+                # The surrounding text is shared by every candidate image on this line
+                if surrounding_text is None:
+                    if lowered_lines is None:
+                        lowered_lines = content.lower().split('\n')
+                    surrounding_text = _surrounding_text(lowered_lines, i)
+
                 # Check if this is a good position for the image based on context
-                if _should_place_image_here(line, image, lines, i):
+                if _context_matches(context_words, surrounding_text):
                     processed_lines.append("")
                     processed_lines.append(f"![{image.filename}]({image.url})")
                     processed_lines.append("")
                     placed_images.add(image.filename)
 
         # Also place images after headings (fallback for images without good context)
-        if line.strip().startswith('#') and i > 0:
+        if line_stripped.startswith('#') and i > 0:
             # Look for unplaced images from current or previous pages
             for page_num in range(max(1, current_page - 1), current_page + 2):
                 if page_num in page_to_images:
@@ -599,40 +737,25 @@ def _integrate_images_into_markdown(content: str, images: list) -> str:
 
     return '\n'.join(processed_lines)
 
-def _is_page_break_indicator(line: str, lines: list, line_index: int) -> bool:
-    """Detect if a line indicates a page break"""
-    line_stripped = line.strip()
-
+def _is_page_break_indicator(line_stripped: str, line_blank: bool,
+                             previous_blank: bool, next_has_content: bool) -> bool:
+    """Detect if a (stripped) line indicates a page break, given whether its neighbours are blank"""
     # Explicit page indicators
-    if any(indicator in line_stripped.lower() for indicator in [
-        'page ', '---', '===', 'chapter ', 'section '
-    ]):
+    if _PAGE_BREAK_INDICATOR_RE.search(line_stripped.lower()):
         return True
 
     # Multiple consecutive empty lines (often indicates page breaks)
-    if (line_stripped == '' and
-        line_index > 0 and
-        line_index < len(lines) - 1 and
-        lines[line_index - 1].strip() == '' and
-        lines[line_index + 1].strip() != ''):
-        return True
-
-    return False
+    return line_blank and previous_blank and next_has_content
 
-def _should_place_image_here(current_line: str, image: ImageInfo, lines: list, line_index: int) -> bool:
-    """Determine if an image should be placed at the current position based on context"""
-    if not image.content_context:
-        return False
-
-    # Get surrounding lines for context matching
+def _surrounding_text(lowered_lines: list, line_index: int) -> str:
+    """Get the lowercased lines around a position for context matching"""
     context_window = 3
     start_idx = max(0, line_index - context_window)
-    end_idx = min(len(lines), line_index + context_window + 1)
-    surrounding_text = ' '.join(lines[start_idx:end_idx]).lower()
-
-    # Check if image context matches surrounding text
-    image_context_words = image.content_context.lower().split()
+    end_idx = min(len(lowered_lines), line_index + context_window + 1)
+    return ' '.join(lowered_lines[start_idx:end_idx])
 
+def _context_matches(image_context_words: list, surrounding_text: str) -> bool:
+    """Determine if an image's (lowercased) context words match the surrounding text"""
     # Look for word matches in surrounding text
     matches = 0
     for word in image_context_words:
@@ -640,7 +763,7 @@ def _should_place_image_here(current_line: str, image: ImageInfo, lines: list, l
             matches += 1
 
     # Place image if we have good context match
-    match_ratio = matches / len(image_context_words) if image_context_words else 0
+    match_ratio = matches / len(image_context_words)
     return match_ratio > 0.3  # 30% of context words should match
 
 def _integrate_images_with_advanced_positioning(content: str, images: list, file_path: str = None) -> str:
@@ -975,8 +1098,12 @@ def _convert_base64_images_to_files(content: str, document_name: str) -> tuple[s
             with open(image_path, 'wb') as f:
                 f.write(image_data)
 
-            # Verify the saved file
-            if not image_path.exists() or image_path.stat().st_size == 0:
+            # Verify the saved file (one stat covers both existence and size)
+            try:
+                saved_size = image_path.stat().st_size
+            except OSError:
+                saved_size = 0
+            if saved_size == 0:
                 start, end = match.span()
                 updated_content = updated_content[:start] + updated_content[end:]
                 continue
@@ -990,7 +1117,7 @@ def _convert_base64_images_to_files(content: str, document_name: str) -> tuple[s
                 width, height = None, None
 
             # Create image info
-            image_info = ImageInfo(
+            image_info = ImageInfo.model_construct(
                 filename=filename,
                 url=f"{image_extractor.base_url}/images/{document_folder.name}/{filename}",
                 width=width,
@@ -1147,38 +1274,102 @@ def _remove_remaining_base64_images(content: str) -> str:
 
     return content
 
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first use"""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=30.0,
+            headers={'User-Agent': _USER_AGENT},
+            http2=True,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=50)
+        )
+    return _http_client
+
+async def close_http_client():
+    """Close the shared HTTP client and its pooled connections"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+def _get_cached_conversion(cache: OrderedDict, key: tuple):
+    """Return cached MarkItDown text, marking it as recently used"""
+    content = cache.get(key)
+    if content is not None:
+        cache.move_to_end(key)
+    return content
+
+def _cache_conversion(cache: OrderedDict, key: tuple, content: str, max_entries: int):
+    """Cache MarkItDown text, evicting the least recently used entries beyond max_entries"""
+    if max_entries <= 0:
+        return
+    cache[key] = content
+    cache.move_to_end(key)
+    while len(cache) > max_entries:
+        cache.popitem(last=False)
+
 async def convert_url(url: str, create_pages: bool = True) -> ConvertResponse:
     """Convert a URL to markdown"""
     try:
-        # Download the file from URL with proper headers
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, timeout=30, headers=headers)
-        response.raise_for_status()
-
-        # Get filename from URL or Content-Disposition header
-        filename = get_filename_from_url(url, response)
-
-        # Create a temporary file with UTF-8 encoding consideration
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-            temp_file.write(response.content)
-            temp_file_path = temp_file.name
+        # Download the file from URL with proper headers, streaming the body into memory
+        # and spilling to a temporary file only once it grows past _URL_IN_MEMORY_LIMIT.
+        # The download awaits the network, so concurrent requests overlap instead of blocking the loop
+        buffer = io.BytesIO()
+        temp_file_path = None
+        async with _get_http_client().stream('GET', url) as response:
+            response.raise_for_status()
+
+            # Get filename from URL or Content-Disposition header
+            filename = get_filename_from_url(url, response)
+
+            # Hash the body while receiving it so a repeated download can reuse its conversion
+            content_hash = hashlib.sha256()
+            temp_file = None
+            try:
+                # aiter_bytes decodes any gzip/deflate content encoding
+                async for chunk in response.aiter_bytes(chunk_size=1024 * 1024):
+                    content_hash.update(chunk)
+                    if temp_file is None and buffer.tell() + len(chunk) > _URL_IN_MEMORY_LIMIT:
+                        temp_file = tempfile.NamedTemporaryFile(delete=False)
+                        temp_file_path = temp_file.name
+                        temp_file.write(buffer.getvalue())
+                        buffer = None
+                    (temp_file or buffer).write(chunk)
+            except BaseException:
+                if temp_file is not None:
+                    temp_file.close()
+                    os.unlink(temp_file_path)
+                raise
+            finally:
+                if temp_file is not None:
+                    temp_file.close()
 
         try:
-            # Convert using MarkItDown
-            result = md.convert(temp_file_path)
-
-            # Ensure the content is properly encoded as UTF-8
-            content = result.text_content
-            if isinstance(content, bytes):
-                content = content.decode('utf-8', errors='replace')
+            # Convert using MarkItDown, unless the same bytes were converted recently
+            cache_key = (content_hash.hexdigest(), filename)
+            content = _get_cached_conversion(_url_convert_cache, cache_key)
+            if content is None:
+                # MarkItDown is synchronous; run it in a worker thread to keep the event loop free
+                if temp_file_path is None:
+                    buffer.seek(0)
+                    result = await asyncio.to_thread(md.convert_stream, buffer)
+                else:
+                    result = await asyncio.to_thread(md.convert, temp_file_path)
+
+                # Ensure the content is properly encoded as UTF-8
+                content = result.text_content
+                if isinstance(content, bytes):
+                    content = content.decode('utf-8', errors='replace')
+                _cache_conversion(_url_convert_cache, cache_key, content, URL_CONVERT_CACHE_SIZE)
 
             # IMMEDIATE base64 cleanup - remove any base64 images created by MarkItDown
             content = _remove_remaining_base64_images(content)
 
-            # Extract images from the file
-            images = image_extractor.extract_images_from_file(temp_file_path, filename)
+            # The extractor picks its format from the file extension, which a download doesn't have,
+            # so only base64 images embedded in the converted content are collected
+            images = []
 
             # Enhance heading detection for Word documents and other formats
             content = _enhance_heading_detection(content, temp_file_path)
@@ -1199,26 +1390,31 @@ async def convert_url(url: str, create_pages: bool = True) -> ConvertResponse:
             # Final cleanup: Remove any remaining base64 images that couldn't be converted
             content = _remove_remaining_base64_images(content)
 
-            return ConvertResponse(
+            # Fields were produced here and are already valid, so skip re-validation
+            return ConvertResponse.model_construct(
                 filename=filename,
                 content=content,
                 images=images
             )
         finally:
             # Clean up temporary file
-            os.unlink(temp_file_path)
+            if temp_file_path is not None:
+                os.unlink(temp_file_path)
 
-    except requests.RequestException as e:
+    except (httpx.HTTPError, httpx.InvalidURL) as e:
         raise HTTPException(status_code=400, detail=f"Error downloading URL: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error converting URL: {str(e)}")
 
 
-async def convert_file(file_path: str, create_pages: bool = True, original_filename: str = None) -> ConvertResponse:
-    """Convert a local file to markdown"""
+async def convert_file(file_path: str, create_pages: bool = True, original_filename: str = None,
+                       cache: bool = True) -> ConvertResponse:
+    """Convert a local file to markdown; cache=False skips the conversion cache for one-off files"""
     try:
-        # Check if file exists
-        if not os.path.exists(file_path):
+        # Check if file exists with a single stat
+        try:
+            file_stat = os.stat(file_path)
+        except (OSError, ValueError):
             raise HTTPException(status_code=404, detail="File not found")
 
         # Always create path_obj for file extension checking
@@ -1231,13 +1427,18 @@ async def convert_file(file_path: str, create_pages: bool = True, original_filen
             # Get filename without extension for display
             filename = path_obj.stem
 
-        # Convert using MarkItDown
-        result = md.convert(file_path)
+        # Convert using MarkItDown, unless this file was converted recently and hasn't changed since
+        cache_key = (file_path, file_stat.st_mtime_ns, file_stat.st_size)
+        content = _get_cached_conversion(_file_convert_cache, cache_key) if cache else None
+        if content is None:
+            result = md.convert(file_path)
 
-        # Ensure the content is properly encoded as UTF-8
-        content = result.text_content
-        if isinstance(content, bytes):
-            content = content.decode('utf-8', errors='replace')
+            # Ensure the content is properly encoded as UTF-8
+            content = result.text_content
+            if isinstance(content, bytes):
+                content = content.decode('utf-8', errors='replace')
+            if cache:
+                _cache_conversion(_file_convert_cache, cache_key, content, FILE_CONVERT_CACHE_SIZE)
 
         # IMMEDIATE base64 cleanup - remove any base64 images created by MarkItDown
         content = _remove_remaining_base64_images(content)
@@ -1273,7 +1474,8 @@ async def convert_file(file_path: str, create_pages: bool = True, original_filen
         # Final cleanup: Remove any remaining base64 images that couldn't be converted
         content = _remove_remaining_base64_images(content)
 
-        return ConvertResponse(
+        # Fields were produced here and are already valid, so skip re-validation
+        return ConvertResponse.model_construct(
             filename=filename,
             content=content,
             images=images
@@ -1283,13 +1485,12 @@ async def convert_file(file_path: str, create_pages: bool = True, original_filen
         raise HTTPException(status_code=500, detail=f"Error converting file: {str(e)}")
 
 
-def get_filename_from_url(url: str, response: requests.Response) -> str:
+def get_filename_from_url(url: str, response: httpx.Response) -> str:
     """Extract filename from URL or Content-Disposition header"""
     # Try to get filename from Content-Disposition header
     content_disposition = response.headers.get('Content-Disposition')
     if content_disposition:
-        import re
-        filename_match = re.search(r'filename[*]?=([^;]+)', content_disposition)
+        filename_match = _CD_FILENAME_RE.search(content_disposition)
         if filename_match:
             filename = filename_match.group(1).strip('"\'')
             # Ensure filename is properly decoded
@@ -1317,52 +1518,70 @@ def get_filename_from_url(url: str, response: requests.Response) -> str:
     fallback_name = f"document_{timestamp}"
     return fallback_name
 
+# Manual mappings for known files or terms - expanded to cover all likely hyperlinked terms
+_MANUAL_HYPERLINKS = {
+    # Historical figures
+    "Pyrrhus": "https://www.worldhistory.org/pyrrhus/",
+    "Villegaignon": "https://www.encyclopedia.com/humanities/encyclopedias-almanacs-transcripts-and-maps/villegaignon-nicolas-durand-de-1510-1572",
+    "Plutarch": "https://www.britannica.com/biography/Plutarch",
+    "Montaigne": "https://www.britannica.com/biography/Michel-de-Montaigne",
+    "Caesar": "https://www.britannica.com/biography/Julius-Caesar-Roman-ruler",
+    "Lycurgus": "https://www.britannica.com/biography/Lycurgus-ancient-Greek-lawgiver",
+    "Plato": "https://www.britannica.com/biography/Plato",
+    "Herodotus": "https://www.britannica.com/biography/Herodotus-Greek-historian",
+    "Seneca": "https://www.britannica.com/biography/Lucius-Annaeus-Seneca-Roman-philosopher",
+
+    # Additional terms that might be hyperlinked
+    "Scythians": "https://www.worldhistory.org/Scythians/",
+    "Propertius": "https://www.britannica.com/biography/Propertius",
+    "Virgil": "https://www.britannica.com/biography/Virgil",
+    "Juvenal": "https://www.britannica.com/biography/Juvenal",
+    "Chrysippus": "https://www.britannica.com/biography/Chrysippus",
+    "Zeno": "https://www.britannica.com/biography/Zeno-of-Citium",
+
+    # Places and concepts
+    "Thermopylae": "https://www.worldhistory.org/thermopylae/",
+    "Salamis": "https://www.worldhistory.org/Battle_of_Salamis/",
+    "Plataea": "https://www.worldhistory.org/Battle_of_Plataea/",
+}
+
+# Whole-word, case-insensitive patterns for the manual terms, plus all of them as one alternation
+_MANUAL_HYPERLINK_TERMS = tuple(_MANUAL_HYPERLINKS)
+_MANUAL_HYPERLINK_PATTERNS = {term: re.compile(r'\b' + re.escape(term) + r'\b', re.IGNORECASE) for term in _MANUAL_HYPERLINK_TERMS}
+_MANUAL_HYPERLINK_RE = re.compile(
+    r'\b(?:' + '|'.join(f'(?P<t{index}>{re.escape(term)})' for index, term in enumerate(_MANUAL_HYPERLINK_TERMS)) + r')\b',
+    re.IGNORECASE
+)
+
+# Existing markdown links, captured so re.split keeps them at odd indices
+_MARKDOWN_LINK_SPLIT_RE = re.compile(r'(\[[^\]]+\]\([^)]+\))')
+
 def _apply_manual_hyperlinks(content: str, file_path: str = None) -> str:
     """Apply manual hyperlink mappings for specific files or common terms"""
 
-    # Manual mappings for known files or terms - expanded to cover all likely hyperlinked terms
-    manual_mappings = {
-        # Historical figures
-        "Pyrrhus": "https://www.worldhistory.org/pyrrhus/",
-        "Villegaignon": "https://www.encyclopedia.com/humanities/encyclopedias-almanacs-transcripts-and-maps/villegaignon-nicolas-durand-de-1510-1572",
-        "Plutarch": "https://www.britannica.com/biography/Plutarch",
-        "Montaigne": "https://www.britannica.com/biography/Michel-de-Montaigne",
-        "Caesar": "https://www.britannica.com/biography/Julius-Caesar-Roman-ruler",
-        "Lycurgus": "https://www.britannica.com/biography/Lycurgus-ancient-Greek-lawgiver",
-        "Plato": "https://www.britannica.com/biography/Plato",
-        "Herodotus": "https://www.britannica.com/biography/Herodotus-Greek-historian",
-        "Seneca": "https://www.britannica.com/biography/Lucius-Annaeus-Seneca-Roman-philosopher",
-
-        # Additional terms that might be hyperlinked
-        "Scythians": "https://www.worldhistory.org/Scythians/",
-        "Propertius": "https://www.britannica.com/biography/Propertius",
-        "Virgil": "https://www.britannica.com/biography/Virgil",
-        "Juvenal": "https://www.britannica.com/biography/Juvenal",
-        "Chrysippus": "https://www.britannica.com/biography/Chrysippus",
-        "Zeno": "https://www.britannica.com/biography/Zeno-of-Citium",
-
-        # Places and concepts
-        "Thermopylae": "https://www.worldhistory.org/thermopylae/",
-        "Salamis": "https://www.worldhistory.org/Battle_of_Salamis/",
-        "Plataea": "https://www.worldhistory.org/Battle_of_Plataea/",
-    }
+    # Find which mapped terms occur at all in one scan; linking a term never makes another one appear
+    present_terms = {_MANUAL_HYPERLINK_TERMS[int(match.lastgroup[1:])]
+                     for match in _MANUAL_HYPERLINK_RE.finditer(content)}
 
     # Apply the manual mappings - only process plain text, not already formatted links
-    for term, url in manual_mappings.items():
+    for term, url in _MANUAL_HYPERLINKS.items():
+        if term not in present_terms:
+            continue
+
         # First, check if this term already exists as a link in the content
         if f'[{term}](' in content:
             continue
 
         # Use a simpler approach to find terms that aren't already links
         # Split content by existing markdown links to process only plain text sections
-        parts = re.split(r'(\[[^\]]+\]\([^)]+\))', content)
+        parts = _MARKDOWN_LINK_SPLIT_RE.split(content)
 
-        for i in range(0, len(parts), 2):  # Process only non-link parts (even indices)
-            # Create a pattern that matches the exact term as a whole word
-            pattern = r'\b' + re.escape(term) + r'\b'
+        # Create a pattern that matches the exact term as a whole word
+        pattern = _MANUAL_HYPERLINK_PATTERNS[term]
 
+        for i in range(0, len(parts), 2):  # Process only non-link parts (even indices)
             # Find the first occurrence in this plain text section
-            match = re.search(pattern, parts[i], re.IGNORECASE)
+            match = pattern.search(parts[i])
 
             if match:
                 start, end = match.span()
@@ -1372,9 +1591,8 @@ def _apply_manual_hyperlinks(content: str, file_path: str = None) -> str:
                 # Replace only this first occurrence in this section
                 parts[i] = parts[i][:start] + replacement + parts[i][end:]
 
+                # Reconstruct the content
+                content = ''.join(parts)
                 break  # Only replace the first occurrence of this term
 
-        # Reconstruct the content
-        content = ''.join(parts)
-
     return content
@@ -125,8 +125,9 @@ async def upload_file(
 
         try:
             # Convert using the updated conversion function that includes base64 cleanup
-            # Pass the original filename to ensure proper folder naming
-            convert_result = await services.convert_file(temp_file_path, create_pages, filename)
+            # Pass the original filename to ensure proper folder naming; the temporary file is
+            # deleted afterwards, so its conversion is not cached
+            convert_result = await services.convert_file(temp_file_path, create_pages, filename, cache=False)
 
             return UploadResponse(
                 filename=filename,
@@ -162,6 +163,8 @@ async def shutdown_event():
     print("Shutting down MarkItDown API server...")
     services.stop_cleanup_scheduler()
     print("Image cleanup scheduler stopped")
+    services.shutdown_pdf_workers()
+    await services.close_http_client()
 
 @app.get("/cleanup-status",
          summary="Get image cleanup status",